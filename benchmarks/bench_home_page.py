@@ -0,0 +1,162 @@
+"""
+Benchmarks the HomePage actions against the offline replay of the site.
+
+The scenarios of the suite run many times, each run a pytest session against the
+HAR recordings of the scenarios (record them first with `pytest --har-mode record`),
+so the sync `HomePage` is measured exactly as the suite uses it, though headless and
+without the configured slow motion delay. Each page object
+method is timed through the timing recorder, and its median, 95th percentile and
+variance are compared with the baselines stored in the repository. An action
+without a baseline fails the benchmark until baselines are stored. Usage:
+
+    python -m benchmarks.bench_home_page                     # Compare with the baselines
+    python -m benchmarks.bench_home_page --update-baselines  # Store the current timings as baselines
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from config.browser_config import load_config
+from config.settings import HEADLESS_ENV_VAR, SLOW_MO_ENV_VAR
+
+
+def summarize(durations):
+    """
+    Compute the statistics of the timings of one action.
+
+    Args:
+        durations (list[float]): Durations in milliseconds
+
+    Returns:
+        dict: `runs`, `median_ms`, `p95_ms` and `variance`
+    """
+    p95 = statistics.quantiles(durations, n=20, method='inclusive')[18] if len(durations) > 1 else durations[0]
+    return {
+        'runs': len(durations),
+        'median_ms': round(statistics.median(durations), 1),
+        'p95_ms': round(p95, 1),
+        'variance': round(statistics.pvariance(durations), 1),
+    }
+
+
+def run_suite(paths, timings_path):
+    """
+    Run the scenarios once against the HAR replay, in a pytest session of their own,
+    headless and without slow motion, which would otherwise dominate every timing.
+
+    Args:
+        paths (list[str]): Test modules or node ids to run
+        timings_path (str): Where the session writes its timings
+
+    Returns:
+        tuple[int, list[dict]]: The pytest exit code and the timing entries of the session
+    """
+    command = [
+        sys.executable, '-m', 'pytest', *paths, '--har-mode', 'replay', '--force-run', '-n', '0', '-q',
+        '--timings-output', timings_path,
+    ]
+    env = {**os.environ, SLOW_MO_ENV_VAR: '0', HEADLESS_ENV_VAR: 'true'}
+    exit_code = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT, env=env).returncode
+    if not os.path.exists(timings_path):
+        return exit_code, []
+    with open(timings_path) as timings_file:
+        return exit_code, json.load(timings_file)['entries']
+
+
+def find_regressions(results, baselines, threshold):
+    """
+    List the actions whose median got slower than their baseline allows, and the
+    actions without a baseline, which cannot be checked.
+
+    Args:
+        results (dict): Statistics per action of this run
+        baselines (dict): Statistics per action of the baseline
+        threshold (float): Accepted slowdown, 0.2 for 20%
+
+    Returns:
+        list[str]: A description of every regression or missing baseline
+    """
+    regressions = []
+    for action, stats in results.items():
+        baseline = baselines.get(action)
+        if not baseline:
+            regressions.append(f"{action}: no baseline, store one with --update-baselines")
+        elif stats['median_ms'] > baseline['median_ms'] * (1 + threshold):
+            regressions.append(
+                f"{action}: median {stats['median_ms']}ms, baseline {baseline['median_ms']}ms "
+                f"(+{stats['median_ms'] / baseline['median_ms'] - 1:.0%})"
+            )
+    return regressions
+
+
+def main(argv=None):
+    settings = load_config()['default'].get('benchmark') or {}
+    parser = argparse.ArgumentParser(description="Benchmark the HomePage actions against the HAR replay.")
+    parser.add_argument('--iterations', type=int, default=settings.get('iterations', 20),
+                        help="Runs of the scenarios")
+    parser.add_argument('--threshold', type=float, default=settings.get('regression_threshold', 0.2),
+                        help="Accepted slowdown of a median before failing, 0.2 for 20%%")
+    parser.add_argument('--update-baselines', action='store_true',
+                        help="Store the timings of this run as the new baselines")
+    args = parser.parse_args(argv)
+    baselines_path = settings.get('baselines', 'benchmarks/baselines.json')
+    output_path = settings.get('output', 'reports/benchmark.json')
+
+    paths = settings.get('paths') or ['features/steps/test_search_steps.py']
+    baselines = {}
+    if os.path.exists(baselines_path):
+        with open(baselines_path) as baselines_file:
+            baselines = json.load(baselines_file)
+    if not baselines and not args.update_baselines:
+        print(f"No baselines in {baselines_path}. Record the HAR fixtures with `pytest --har-mode record`, "
+              f"then store baselines on this machine with "
+              f"`python -m benchmarks.bench_home_page --update-baselines`.")
+        return 2
+
+    durations = {}
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        for run in range(args.iterations):
+            exit_code, entries = run_suite(paths, os.path.join(directory, f"timings_{run}.json"))
+            if exit_code != 0:
+                failures += 1
+                print(f"Run {run + 1} failed (pytest exit code {exit_code}), "
+                      f"are the HAR fixtures recorded with `pytest --har-mode record`?")
+            for entry in entries:
+                if entry['kind'] == 'page' and not entry['failed']:
+                    durations.setdefault(entry['name'], []).append(entry['duration_ms'])
+    if not durations:
+        print("No timings were recorded.")
+        return 1
+    results = {action: summarize(values) for action, values in sorted(durations.items())}
+
+    print(f"{'Action':<55}{'Runs':>6}{'Median':>10}{'p95':>10}{'Variance':>12}{'Baseline':>10}")
+    for action, stats in results.items():
+        baseline = baselines.get(action, {}).get('median_ms', '-')
+        print(f"{action:<55}{stats['runs']:>6}{stats['median_ms']:>10}{stats['p95_ms']:>10}"
+              f"{stats['variance']:>12}{baseline:>10}")
+
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    with open(output_path, 'w') as output_file:
+        json.dump({'failed_runs': failures, 'actions': results}, output_file, indent=2)
+
+    if args.update_baselines:
+        with open(baselines_path, 'w') as baselines_file:
+            json.dump(results, baselines_file, indent=2)
+            baselines_file.write('\n')
+        print(f"Baselines written to {baselines_path}.")
+        return 0
+
+    regressions = find_regressions(results, baselines, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{args.iterations - failures} runs passed, {failures} failed, {len(regressions)} regressions.")
+    return 1 if regressions or failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
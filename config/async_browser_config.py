@@ -0,0 +1,138 @@
+import os
+
+from config.browser_config import HAR_MODES, har_content_mode, load_config
+from config.browser_server import server_endpoint
+from config.logger_config import setup_logger
+from config.network_config import ResourceBlocker
+
+logger = setup_logger(__name__)
+
+
+class AsyncBrowserManager:
+    """
+    Manages browser instances using the asyncio Playwright API.
+
+    The asyncio counterpart of `BrowserManager`: a single browser process serves many
+    scenarios running concurrently as tasks, each one in its own browser context.
+    Since launching is asynchronous, instances are created with `await AsyncBrowserManager.start()`.
+    """
+
+    def __init__(self):
+        """
+        Initializes the AsyncBrowserManager by loading the configuration.
+
+        The browser itself is launched by `start()`.
+        """
+        config = load_config()['default']
+        self.browser_type = config['browser']
+        self.headless = config['headless']
+        self.timeout = config['timeout']
+        self.slow_mo = config['slow_mo']
+        self.base_url = config['base_url']
+        self.blocking = config.get('blocking')
+        self.resource_blockers = {}
+        self.browser_server = config.get('browser_server')
+        self.playwright = None
+        self.browser = None
+
+    @classmethod
+    async def start(cls):
+        """
+        Creates a manager, starts Playwright and launches the configured browser.
+
+        Returns:
+            AsyncBrowserManager: A manager with a running browser.
+        """
+        from playwright.async_api import async_playwright  # Slow to import, so only once a browser is needed
+
+        manager = cls()
+        manager.playwright = await async_playwright().start()
+        manager.browser = await manager._connect_browser() or await manager._launch_browser()
+        return manager
+
+    async def _connect_browser(self):
+        """
+        Connects to the browser server when one is enabled and running.
+
+        Returns:
+            Browser: The browser of the server, or None when it has to be launched locally.
+        """
+        from playwright.async_api import Error
+
+        endpoint = server_endpoint(self.browser_server, self.browser_type, self.headless)
+        if endpoint is None:
+            return None
+        try:
+            browser = await self.playwright.chromium.connect_over_cdp(endpoint, slow_mo=self.slow_mo)
+        except Error as error:
+            logger.warning(f"Could not connect to the browser server at {endpoint}, launching locally: {error}")
+            return None
+        logger.info(f"Connected to the browser server at {endpoint}.")
+        return browser
+
+    async def _launch_browser(self):
+        """
+        Launches the browser based on the configuration.
+
+        Returns:
+            Browser: A Playwright browser instance.
+
+        Raises:
+            ValueError: If the browser type specified in the config is unsupported.
+        """
+        if self.browser_type not in ('chromium', 'firefox', 'webkit'):
+            raise ValueError(f"Unsupported browser: {self.browser_type}")
+        browser_type = getattr(self.playwright, self.browser_type)
+        return await browser_type.launch(args=['--start-maximized'], headless=self.headless, slow_mo=self.slow_mo)
+
+    async def new_context(self, har_path=None, har_mode='off'):
+        """
+        Creates a new browser context.
+
+        Behaves like `BrowserManager.new_context`, including HAR recording or replay and
+        the resource blocker from the configuration.
+
+        Args:
+            har_path (str): Path of the HAR archive (`.har` or `.zip`) to record to or replay from.
+            har_mode (str): One of `off`, `record` or `replay`.
+
+        Returns:
+            BrowserContext: A new browser context instance.
+
+        Raises:
+            ValueError: If the HAR mode is unsupported.
+            FileNotFoundError: If a replay is requested for an archive that was never recorded.
+        """
+        if har_mode not in HAR_MODES:
+            raise ValueError(f"Unsupported HAR mode: {har_mode}")
+        context = await self.browser.new_context(no_viewport=True)
+        if har_mode == 'record':
+            os.makedirs(os.path.dirname(har_path) or '.', exist_ok=True)
+            await context.route_from_har(har_path, update=True, update_content=har_content_mode(har_path))
+        elif har_mode == 'replay':
+            if not os.path.exists(har_path):
+                await context.close()
+                raise FileNotFoundError(f"No recording found at {har_path}, run with --har-mode=record first")
+            await context.route_from_har(har_path, not_found='abort')
+        blocker = ResourceBlocker.from_config(self.blocking)
+        if blocker:
+            await blocker.install_async(context)
+            self.resource_blockers[context] = blocker
+        return context
+
+    async def close_context(self, context):
+        """
+        Closes a context created by `new_context` and forgets its resource blocker.
+
+        Args:
+            context (BrowserContext): The context to close.
+        """
+        self.resource_blockers.pop(context, None)
+        await context.close()
+
+    async def close(self):
+        """
+        Closes the browser and stops Playwright.
+        """
+        await self.browser.close()
+        await self.playwright.stop()
@@ -1,18 +1,14 @@
-import yaml
-from playwright.sync_api import sync_playwright
+import os
 
-def load_config():
-    """
-    Loads the browser configuration from a YAML file.
+from config.browser_server import server_endpoint
+from config.logger_config import setup_logger
+from config.network_config import ResourceBlocker
+from config.settings import load_config
 
-    This function opens the 'config.yaml' file and safely loads the configuration 
-    data, returning it as a dictionary.
-    
-    Returns:
-        dict: The loaded configuration data from the YAML file.
-    """
-    with open('config/config.yaml', 'r') as config_file:
-        return yaml.safe_load(config_file)
+logger = setup_logger(__name__)
+
+# Network recording modes supported by `BrowserManager.new_context`
+HAR_MODES = ('off', 'record', 'replay')
 
 class BrowserManager:
     """
@@ -30,13 +26,42 @@ class BrowserManager:
         It reads the default configuration values from the YAML file, sets the browser type, 
         headless mode, timeout, and slow-motion settings, and then launches the browser.
         """
+        from playwright.sync_api import sync_playwright  # Slow to import, so only once a browser is needed
+
         self.playwright = sync_playwright().start()
         config = load_config()['default']
         self.browser_type = config['browser']
         self.headless = config['headless']
         self.timeout = config['timeout']
         self.slow_mo = config['slow_mo']
-        self.browser = self._launch_browser()
+        self.base_url = config['base_url']
+        self.blocking = config.get('blocking')
+        self.resource_blockers = {}
+        self.browser_server = config.get('browser_server')
+        self.browser = self._connect_browser() or self._launch_browser()
+
+    def _connect_browser(self):
+        """
+        Connects to the browser server when one is enabled and running.
+
+        See `config.browser_server`. A server that cannot be reached is skipped so the
+        browser is launched locally instead.
+
+        Returns:
+            Browser: The browser of the server, or None when it has to be launched locally.
+        """
+        from playwright.sync_api import Error
+
+        endpoint = server_endpoint(self.browser_server, self.browser_type, self.headless)
+        if endpoint is None:
+            return None
+        try:
+            browser = self.playwright.chromium.connect_over_cdp(endpoint, slow_mo=self.slow_mo)
+        except Error as error:
+            logger.warning(f"Could not connect to the browser server at {endpoint}, launching locally: {error}")
+            return None
+        logger.info(f"Connected to the browser server at {endpoint}.")
+        return browser
 
     def _launch_browser(self):
         """
@@ -72,24 +97,63 @@ class BrowserManager:
         """
         return self.browser.new_page()
 
-    def new_context(self):
+    def new_context(self, har_path=None, har_mode='off'):
         """
         Creates a new browser context.
 
         A browser context allows for multiple independent sessions within the same browser. 
         Each context can have its own cookies, cache, and settings.
-        
+
+        When a HAR mode is given, the context network traffic is bound to `har_path`:
+        in `record` mode every response is saved to the archive when the context is closed,
+        and in `replay` mode responses are served from the archive and any request that
+        was not recorded is aborted, so no network access is needed.
+
+        When `blocking` is enabled in the configuration, a `ResourceBlocker` is routed on the
+        context and kept in `resource_blockers` so that scenarios can apply their overrides.
+
+        Args:
+            har_path (str): Path of the HAR archive (`.har` or `.zip`) to record to or replay from.
+            har_mode (str): One of `off`, `record` or `replay`.
+
         Returns:
             BrowserContext: A new browser context instance.
+
+        Raises:
+            ValueError: If the HAR mode is unsupported.
+            FileNotFoundError: If a replay is requested for an archive that was never recorded.
         """
-        return self.browser.new_context(no_viewport=True)
+        if har_mode not in HAR_MODES:
+            raise ValueError(f"Unsupported HAR mode: {har_mode}")
+        context = self.browser.new_context(no_viewport=True)
+        if har_mode == 'record':
+            os.makedirs(os.path.dirname(har_path) or '.', exist_ok=True)
+            context.route_from_har(har_path, update=True, update_content=har_content_mode(har_path))
+        elif har_mode == 'replay':
+            if not os.path.exists(har_path):
+                context.close()
+                raise FileNotFoundError(f"No recording found at {har_path}, run with --har-mode=record first")
+            context.route_from_har(har_path, not_found='abort')
+        blocker = ResourceBlocker.from_config(self.blocking)
+        if blocker:
+            blocker.install(context)  # Registered last, so it runs before the HAR routes
+            self.resource_blockers[context] = blocker
+        return context
 
     def close(self):
         """
         Closes the browser and stops Playwright.
 
         This method closes the currently active browser instance and stops the Playwright process 
-        to free up resources.
+        to free up resources. A browser server is only disconnected from and keeps running.
         """
         self.browser.close()
         self.playwright.stop()
+
+def har_content_mode(har_path):
+    """
+    Chooses how response bodies are stored in a HAR recording.
+
+    Zip archives keep bodies as separate entries, plain `.har` files embed them inline.
+    """
+    return 'attach' if har_path.endswith('.zip') else 'embed'
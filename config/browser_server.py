@@ -0,0 +1,164 @@
+"""
+Keeps a Chromium browser running between test runs.
+
+`BrowserManager` connects to it over the Chrome DevTools Protocol when
+`browser_server.enabled` is set, instead of launching a browser on every run.
+Usage:
+
+    python -m config.browser_server start    # Run the server in the foreground (Ctrl+C stops it)
+    python -m config.browser_server status
+    python -m config.browser_server stop
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+
+from config.logger_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def read_state(state_file):
+    """
+    Read the state file a running server wrote.
+
+    Args:
+        state_file (str): Path of the state file
+
+    Returns:
+        dict: `pid`, `endpoint`, `browser` and `headless` of the server, or None without a server
+    """
+    try:
+        with open(state_file) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _endpoint_responds(endpoint, timeout):
+    import urllib.request  # Slow to import, and only needed when a server is running
+
+    try:
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=timeout) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def server_endpoint(settings, browser_type, headless):
+    """
+    Find a running browser server matching the configured browser.
+
+    A state file left by a server that died, or whose browser no longer answers,
+    is removed so that the next run does not try it again.
+
+    Args:
+        settings (dict): The `browser_server` section of config.yaml
+        browser_type (str): The configured browser
+        headless (bool): The configured headless mode
+
+    Returns:
+        str: The DevTools endpoint to connect to, or None to launch a browser locally
+    """
+    if not settings or not settings.get('enabled'):
+        return None
+    state_file = settings.get('state_file', '.browser_server.json')
+    state = read_state(state_file)
+    if state is None:
+        logger.info("No browser server running, launching the browser locally.")
+        return None
+    if state.get('browser') != browser_type or state.get('headless') != headless:
+        logger.info(f"Browser server runs {state.get('browser')} (headless: {state.get('headless')}), "
+                    f"launching {browser_type} locally.")
+        return None
+    if not _process_alive(state['pid']) or \
+            not _endpoint_responds(state['endpoint'], settings.get('connect_timeout', 2000) / 1000):
+        logger.warning(f"Removing stale browser server state {state_file} (pid {state['pid']}).")
+        os.remove(state_file)
+        return None
+    return state['endpoint']
+
+
+def serve(settings, config):
+    """
+    Launch Chromium with remote debugging enabled and keep it running until interrupted.
+
+    Args:
+        settings (dict): The `browser_server` section of config.yaml
+        config (dict): The `default` section of config.yaml
+    """
+    state_file = settings.get('state_file', '.browser_server.json')
+    port = settings.get('port', 9333)
+    from playwright.sync_api import sync_playwright
+
+    playwright = sync_playwright().start()
+    browser = playwright.chromium.launch(
+        args=['--start-maximized', f'--remote-debugging-port={port}'], headless=config['headless'],
+    )
+    with open(state_file, 'w') as file:
+        json.dump({
+            'pid': os.getpid(), 'endpoint': f"http://127.0.0.1:{port}",
+            'browser': 'chromium', 'headless': config['headless'],
+        }, file)
+    logger.info(f"Browser server listening on port {port}.")
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    try:
+        while not stopped.wait(1) and browser.is_connected():
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if (read_state(state_file) or {}).get('pid') == os.getpid():
+            os.remove(state_file)
+        browser.close()
+        playwright.stop()
+        logger.info("Browser server stopped.")
+
+
+def main(argv=None):
+    # Imported here since browser_config itself relies on this module
+    from config.browser_config import load_config
+
+    config = load_config()['default']
+    settings = config.get('browser_server') or {}
+    state_file = settings.get('state_file', '.browser_server.json')
+    parser = argparse.ArgumentParser(description="Keep a Chromium browser running between test runs.")
+    parser.add_argument('command', choices=('start', 'stop', 'status'))
+    args = parser.parse_args(argv)
+
+    state = read_state(state_file)
+    running = state is not None and _process_alive(state['pid'])
+    if args.command == 'start':
+        if running:
+            print(f"A browser server is already running (pid {state['pid']}).")
+            return 1
+        serve(settings, config)
+    elif args.command == 'stop':
+        if not running:
+            print("No browser server is running.")
+            return 1
+        os.kill(state['pid'], signal.SIGTERM)
+        print(f"Stopped the browser server (pid {state['pid']}).")
+    else:
+        print(f"Browser server running at {state['endpoint']} (pid {state['pid']})." if running
+              else "No browser server is running.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from config.logger_config import setup_logger
+
+if TYPE_CHECKING:
+    from playwright.sync_api import BrowserContext, Page
+
+logger = setup_logger(__name__)
+
+# Clears what a scenario left in the storage of the page's origin
+CLEAR_STORAGE_SCRIPT = "() => { localStorage.clear(); sessionStorage.clear(); }"
+
+# JavaScript heap of the page in bytes, null outside Chromium
+USED_HEAP_SCRIPT = "() => performance.memory ? performance.memory.usedJSHeapSize : null"
+
+
+@dataclass
+class PooledContext:
+    """
+    A browser context kept warm by the `ContextPool`, with the page scenarios use.
+
+    Attributes:
+        context (BrowserContext): The pooled context
+        page (Page): Its page, already on the homepage when handed out
+        uses (int): Number of scenarios that ran in the context
+    """
+    context: 'BrowserContext'
+    page: 'Page'
+    uses: int = 0
+
+
+class ContextPool:
+    """
+    Keeps browser contexts that already loaded the homepage ready for the next scenario.
+
+    A released context is reset (cookies, storage, page routes, blocker overrides) and
+    navigated back to the homepage, so the next scenario starts on a loaded page with the
+    site assets cached. Contexts are replaced after `max_uses` scenarios or once the page
+    uses more than `max_memory_mb` of JavaScript heap.
+    """
+
+    def __init__(self, manager, size=2, max_uses=20, max_memory_mb=None):
+        """
+        Create the pool and warm up its contexts.
+
+        Args:
+            manager (BrowserManager): Creates the contexts
+            size (int): Number of contexts kept warm
+            max_uses (int): Scenarios run in a context before it is replaced
+            max_memory_mb (int): JavaScript heap above which a context is replaced, None for no limit
+        """
+        self.manager = manager
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.idle = deque(self._create() for _ in range(size))
+        logger.info(f"Warmed up {size} browser contexts.")
+
+    @classmethod
+    def from_config(cls, manager, settings):
+        """
+        Build a pool from the `context_pool` section of the YAML configuration.
+
+        Args:
+            manager (BrowserManager): Creates the contexts
+            settings (dict): The `context_pool` settings, may be None
+
+        Returns:
+            ContextPool: The pool, or None when pooling is disabled
+        """
+        settings = settings or {}
+        if not settings.get('enabled', False):
+            return None
+        return cls(manager, settings.get('size', 2), settings.get('max_uses', 20), settings.get('max_memory_mb'))
+
+    def _create(self):
+        context = self.manager.new_context()
+        page = context.new_page()
+        page.goto(self.manager.base_url, wait_until='domcontentloaded')
+        return PooledContext(context, page)
+
+    def _discard(self, pooled):
+        from playwright.sync_api import Error
+
+        self.manager.resource_blockers.pop(pooled.context, None)
+        try:
+            pooled.context.close()
+        except Error as error:
+            logger.warning(f"Could not close a pooled context: {error}")
+
+    def _used_memory_mb(self, page):
+        used_heap = page.evaluate(USED_HEAP_SCRIPT)
+        return used_heap / 1024 / 1024 if used_heap is not None else None
+
+    def acquire(self):
+        """
+        Hand out a warm context, or a new one when all of them are in use.
+
+        Returns:
+            PooledContext: A context whose page is on the homepage
+        """
+        return self.idle.popleft() if self.idle else self._create()
+
+    def release(self, pooled):
+        """
+        Reset a context after a scenario and return it to the pool, or replace it
+        when it was used too often, uses too much memory or cannot be reset.
+
+        Args:
+            pooled (PooledContext): The context handed out by `acquire`
+        """
+        from playwright.sync_api import Error
+
+        pooled.uses += 1
+        try:
+            memory_mb = self._used_memory_mb(pooled.page) if self.max_memory_mb else None
+            if pooled.uses >= self.max_uses or (memory_mb is not None and memory_mb > self.max_memory_mb):
+                logger.info(f"Recycling a context after {pooled.uses} scenarios"
+                            + (f" using {memory_mb:.0f} MB." if memory_mb is not None else "."))
+                self._discard(pooled)
+                self.idle.append(self._create())
+                return
+            self._reset(pooled)
+        except Error as error:
+            logger.warning(f"Replacing a context that could not be reset: {error}")
+            self._discard(pooled)
+            self.idle.append(self._create())
+            return
+        self.idle.append(pooled)
+
+    def _reset(self, pooled):
+        for extra_page in pooled.context.pages:
+            if extra_page is not pooled.page:
+                extra_page.close()
+        pooled.page.unroute_all(behavior='ignoreErrors')
+        pooled.context.clear_cookies()
+        pooled.page.evaluate(CLEAR_STORAGE_SCRIPT)
+        blocker = self.manager.resource_blockers.get(pooled.context)
+        if blocker:
+            blocker.apply_tags(())
+        # A fresh load of the homepage drops the filters and any state kept in the page
+        pooled.page.goto(self.manager.base_url, wait_until='domcontentloaded')
+
+    def close(self):
+        """Close every idle context."""
+        while self.idle:
+            self._discard(self.idle.popleft())
@@ -0,0 +1,121 @@
+from config.logger_config import setup_logger
+
+logger = setup_logger(__name__)
+
+# Scenario tags selecting an emulation profile, e.g. @emulate_slow_4g
+EMULATE_TAG_PREFIX = 'emulate_'
+
+# Network conditions of an unthrottled page
+NO_NETWORK_THROTTLING = {'offline': False, 'latency': 0, 'downloadThroughput': -1, 'uploadThroughput': -1}
+
+
+class Throttling:
+    """
+    Slows the network and CPU of a page down to the conditions of a named profile.
+
+    Profiles come from the `emulation.profiles` section of the YAML configuration and
+    are applied through a Chrome DevTools Protocol session, so throttling only works
+    on Chromium; other browsers run unthrottled and log a warning.
+    """
+
+    def __init__(self, page, names, profile):
+        """
+        Initializes the throttling of a page, applied with `apply`.
+
+        Args:
+            page (Page): The page to throttle.
+            names (list[str]): Names of the profiles, for the logs and reports.
+            profile (dict): `latency_ms`, `download_kbps`, `upload_kbps` and `cpu_slowdown`
+                of the combined profiles, any of them optional.
+        """
+        self.page = page
+        self.names = names
+        self.profile = profile
+        self.session = None
+
+    @classmethod
+    def from_tags(cls, page, tags, profiles):
+        """
+        Builds the throttling a scenario asks for with its `@emulate_<profile>` tags.
+
+        Several tags combine, e.g. a network profile with a CPU one.
+
+        Args:
+            page (Page): The page of the scenario.
+            tags (Iterable[str]): The tag (marker) names of the scenario.
+            profiles (dict): The `emulation.profiles` settings.
+
+        Returns:
+            Throttling: The throttling to apply, or None when the scenario has no emulation tag.
+
+        Raises:
+            ValueError: If a tag names a profile missing from the configuration.
+        """
+        names = profile_names(tags)
+        if not names:
+            return None
+        profile = {}
+        for name in names:
+            if name not in (profiles or {}):
+                raise ValueError(f"Unknown emulation profile: {name}")
+            profile.update(profiles[name])
+        return cls(page, names, profile)
+
+    @property
+    def description(self):
+        """Human readable summary of the applied conditions."""
+        details = ", ".join(f"{setting}={value}" for setting, value in self.profile.items())
+        return f"{' + '.join(self.names)} ({details})"
+
+    def apply(self):
+        """
+        Applies the network and CPU conditions to the page.
+
+        Returns:
+            bool: Whether the conditions could be applied (Chromium only).
+        """
+        browser = self.page.context.browser
+        if browser and browser.browser_type.name != 'chromium':
+            logger.warning(f"Emulation profile {' + '.join(self.names)} needs Chromium, running unthrottled.")
+            return False
+        self.session = self.page.context.new_cdp_session(self.page)
+        if any(setting in self.profile for setting in ('latency_ms', 'download_kbps', 'upload_kbps')):
+            self.session.send('Network.enable')
+            self.session.send('Network.emulateNetworkConditions', {
+                'offline': False,
+                'latency': self.profile.get('latency_ms', 0),
+                'downloadThroughput': _bytes_per_second(self.profile.get('download_kbps')),
+                'uploadThroughput': _bytes_per_second(self.profile.get('upload_kbps')),
+            })
+        if 'cpu_slowdown' in self.profile:
+            self.session.send('Emulation.setCPUThrottlingRate', {'rate': self.profile['cpu_slowdown']})
+        logger.info(f"Emulating {self.description}.")
+        return True
+
+    def clear(self):
+        """
+        Restores full speed, for pages that are reused after the scenario.
+        """
+        if self.session is None:
+            return
+        self.session.send('Network.emulateNetworkConditions', NO_NETWORK_THROTTLING)
+        self.session.send('Emulation.setCPUThrottlingRate', {'rate': 1})
+        self.session.detach()
+        self.session = None
+
+
+def profile_names(tags):
+    """
+    The profiles a scenario asks for with its `@emulate_<profile>` tags.
+
+    Args:
+        tags (Iterable[str]): The tag (marker) names of the scenario.
+
+    Returns:
+        list[str]: The profile names, sorted.
+    """
+    return sorted(tag[len(EMULATE_TAG_PREFIX):] for tag in set(tags) if tag.startswith(EMULATE_TAG_PREFIX))
+
+
+def _bytes_per_second(kbps):
+    return kbps * 1000 / 8 if kbps else -1
@@ -1,47 +1,160 @@
+import atexit
+import copy
+import json
 import logging
 import os
+import queue
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
-def setup_logger():
-    # Define the path to the 'logs' folder in the root of the project
-    log_directory = os.path.join(os.getcwd(), 'logs')
+from config.settings import load_config
+from utils.timing import current, recorder
 
-    # Create the directory if it doesn't exist
-    if not os.path.exists(log_directory):
-        os.makedirs(log_directory)
+# Writes the records queued by every thread of the process, started by the first `setup_logger` call
+_listener = None
 
-    # Define the path to the log file
-    log_file_path = os.path.join(log_directory, 'test_log.log')
 
-    # Create the logger
-    logger = logging.getLogger(__name__)
-    logger.setLevel(logging.INFO)  # Set the level of the logger
+class ContextFilter(logging.Filter):
+    """
+    Stamps every record with the scenario, step and pytest-xdist worker it was logged from.
 
-    # Remove existing handlers to avoid duplicates
-    if logger.hasHandlers():
-        logger.handlers.clear()
+    Runs in the thread that logs, before the record is queued, since the current scenario
+    and step are only known there.
+    """
 
-    # Create file handler which logs to the file
-    file_handler = logging.FileHandler(log_file_path, mode='a')
-    file_handler.setLevel(logging.INFO)
+    def filter(self, record):
+        record.scenario = recorder.scenario
+        record.step = current('step')
+        record.worker = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+        return True
 
-    # Create console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
 
-    # Define the format for the logs
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
+class ContextQueueHandler(QueueHandler):
+    """
+    Queues records with their traceback kept apart from the message.
 
-    # Add the handlers to the logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    `QueueHandler.prepare` merges the formatted traceback into the message and drops it;
+    here it is formatted in the thread that logs, where `exc_info` is still valid, and
+    kept in `exc_text` so that the JSON lines hold it in their `exception` field.
+    """
 
-    return logger
+    def prepare(self, record):
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
 
-# Make sure to close handlers at the end to avoid unclosed resource warnings
-def close_logger(logger):
-    handlers = logger.handlers[:]
-    for handler in handlers:
-        handler.close()
-        logger.removeHandler(handler)
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object per line.
+    """
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'scenario': getattr(record, 'scenario', None),
+            'step': getattr(record, 'step', None),
+            'worker': getattr(record, 'worker', None),
+        }
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry)
+
+
+def _logging_settings():
+    """
+    Reads the `logging` section of the YAML configuration.
+    """
+    return load_config()['default'].get('logging') or {}
+
+
+def _worker_log_file(path):
+    """
+    Gives every pytest-xdist worker its own log file, so that rotation never races.
+    """
+    worker = os.environ.get('PYTEST_XDIST_WORKER')
+    if not worker:
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}.{worker}{extension}"
+
+
+def _start_listener():
+    settings = _logging_settings()
+    log_file_path = _worker_log_file(settings.get('file', 'logs/test_log.jsonl'))
+    os.makedirs(os.path.dirname(log_file_path) or '.', exist_ok=True)
+
+    # Handlers doing the actual I/O, run by the listener thread
+    file_handler = RotatingFileHandler(
+        log_file_path, maxBytes=settings.get('max_bytes', 10 * 1024 * 1024),
+        backupCount=settings.get('backup_count', 5), encoding='utf-8',
+    )
+    file_handler.setFormatter(JsonFormatter())
+    handlers = [file_handler]
+    if settings.get('console', True):
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(settings.get('console_level', 'INFO'))
+        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        handlers.append(console_handler)
+
+    # The thread that logs only stamps the record and puts it on the queue
+    log_queue = queue.SimpleQueue()
+    queue_handler = ContextQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    root_logger = logging.getLogger()
+    root_logger.addHandler(queue_handler)
+    root_logger.setLevel(settings.get('level', 'INFO'))
+    for name, level in (settings.get('levels') or {}).items():
+        logging.getLogger(name).setLevel(level)
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.queue_handler = queue_handler
+    listener.start()
+    return listener
+
+
+def setup_logger(name=__name__):
+    """
+    Returns the logger of a module, setting up the logging pipeline on first use.
+
+    Records are queued by the thread that logs and written in the background as JSON lines
+    to a size-rotated file (one per pytest-xdist worker) and to the console. The levels,
+    per module included, come from the `logging` section of `config.yaml`.
+
+    Args:
+        name (str): Name of the logger, the calling module's `__name__`
+
+    Returns:
+        logging.Logger: The logger
+    """
+    global _listener
+    if _listener is None:
+        _listener = _start_listener()
+    return logging.getLogger(name)
+
+
+def close_logger(logger=None):
+    """
+    Flushes the queued records and stops the background writer, also run at exit.
+
+    Args:
+        logger (logging.Logger): Unused, kept for callers passing their logger
+    """
+    global _listener
+    if _listener is not None:
+        logging.getLogger().removeHandler(_listener.queue_handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+# Registered once for the process; it does nothing while no listener is running
+atexit.register(close_logger)
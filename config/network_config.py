@@ -0,0 +1,135 @@
+import re
+from collections import Counter
+
+# Scenario tags that relax the blocking rules for a single scenario
+NO_BLOCKING_TAG = 'no_blocking'
+ALLOW_TAG_PREFIX = 'allow_'
+
+
+class ResourceBlocker:
+    """
+    Aborts the requests a scenario does not need before they reach the network.
+
+    Requests are matched by Playwright resource type (image, font, media...) and by
+    URL regular expressions (analytics, third-party tags...). URLs matching an allow
+    pattern are never blocked. Every blocked request is counted per resource type.
+    """
+
+    def __init__(self, resource_types=(), url_patterns=(), allow_patterns=()):
+        """
+        Initializes the blocker with its default rules.
+
+        Args:
+            resource_types (Iterable[str]): Playwright resource types to block.
+            url_patterns (Iterable[str]): Regular expressions of URLs to block.
+            allow_patterns (Iterable[str]): Regular expressions of URLs that must never be blocked.
+        """
+        self.resource_types = frozenset(resource_types)
+        self.url_patterns = [re.compile(pattern) for pattern in url_patterns]
+        self.allow_patterns = [re.compile(pattern) for pattern in allow_patterns]
+        self.enabled = True
+        self.allowed_types = frozenset()
+        self.blocked = Counter()
+
+    @classmethod
+    def from_config(cls, blocking):
+        """
+        Builds a blocker from the `blocking` section of the YAML configuration.
+
+        Args:
+            blocking (dict): The `blocking` settings, may be None.
+
+        Returns:
+            ResourceBlocker: The configured blocker, or None when blocking is disabled.
+        """
+        blocking = blocking or {}
+        if not blocking.get('enabled', False):
+            return None
+        return cls(
+            blocking.get('resource_types') or (),
+            blocking.get('url_patterns') or (),
+            blocking.get('allow_patterns') or (),
+        )
+
+    def install(self, target):
+        """
+        Routes every request of a browser context (or page) through the blocker.
+
+        Requests that are not blocked fall back to the routes registered before, so
+        the blocker composes with HAR replay.
+
+        Args:
+            target (BrowserContext | Page): Where the route is registered.
+        """
+        target.route('**/*', self._handle)
+
+    async def install_async(self, target):
+        """
+        Routes every request of an asyncio browser context (or page) through the blocker.
+
+        Args:
+            target (BrowserContext | Page): Where the route is registered, from `playwright.async_api`.
+        """
+        await target.route('**/*', self._handle_async)
+
+    def apply_tags(self, tags):
+        """
+        Applies the overrides of a scenario from its tags and resets the counters.
+
+        `@no_blocking` disables blocking for the scenario and `@allow_<resource type>`
+        (for example `@allow_image`) lets that resource type through.
+
+        Args:
+            tags (Iterable[str]): The tag (marker) names of the scenario.
+        """
+        tags = set(tags)
+        self.enabled = NO_BLOCKING_TAG not in tags
+        self.allowed_types = frozenset(
+            tag[len(ALLOW_TAG_PREFIX):] for tag in tags if tag.startswith(ALLOW_TAG_PREFIX)
+        )
+        self.blocked.clear()
+
+    def should_block(self, url, resource_type):
+        """
+        Tells whether a request is blocked by the current rules.
+
+        Args:
+            url (str): The request URL.
+            resource_type (str): The Playwright resource type of the request.
+
+        Returns:
+            bool: True if the request must be aborted.
+        """
+        if not self.enabled or any(pattern.search(url) for pattern in self.allow_patterns):
+            return False
+        if resource_type in self.resource_types and resource_type not in self.allowed_types:
+            return True
+        return any(pattern.search(url) for pattern in self.url_patterns)
+
+    def summary(self):
+        """
+        Describes what was blocked since the last reset.
+
+        Aborted requests never transfer a response, so only request counts are known.
+
+        Returns:
+            str: The number of blocked requests, in total and per resource type.
+        """
+        details = ", ".join(f"{kind}={count}" for kind, count in self.blocked.most_common())
+        return f"Blocked {sum(self.blocked.values())} requests" + (f" ({details})" if details else "")
+
+    def _handle(self, route):
+        request = route.request
+        if self.should_block(request.url, request.resource_type):
+            self.blocked[request.resource_type] += 1
+            route.abort('blockedbyclient')
+        else:
+            route.fallback()
+
+    async def _handle_async(self, route):
+        request = route.request
+        if self.should_block(request.url, request.resource_type):
+            self.blocked[request.resource_type] += 1
+            await route.abort('blockedbyclient')
+        else:
+            await route.fallback()
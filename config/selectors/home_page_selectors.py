@@ -12,6 +12,9 @@ class HomePageCitySelectors(Enum):
     LABEL_ALASKA = "alaska"
     LABEL_ARIZONA = "arizona"
     LABEL_CALIFORNIA = "california"
+    LABEL_WYOMING = "wyoming"
+    LABEL_WISCONSIN = "wisconsin"
+    LABEL_WASHINGTON = "washington"
     LABEL_VIRGINIA = "virginia"
     LABEL_VERMONT = "vermont"
     LABEL_UTAH = "utah"
@@ -39,3 +42,9 @@ class HomePageCitySelectors(Enum):
     LABEL_CHIHUAHUA = "chihuahua"
 
 
+class HomePageResultSelectors(Enum):
+    PROPERTIES_LIST = "#properties-list"
+    PROPERTY_CARD = "#properties-list a"
+    PROPERTY_LOCATION = "div.text-property-eyebrow"
+    PROPERTY_DATES = "span.whitespace-nowrap.text-6-white"
+    PROPERTY_GUESTS = "div.flex.items-center.gap-1.text-sm.pl-1 span:nth-of-type(3)"
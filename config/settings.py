@@ -0,0 +1,111 @@
+import copy
+import os
+import time
+
+from utils.startup_profile import profile
+
+# The configuration file, found next to this module whatever the working directory
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.yaml')
+
+# Environment variable overriding `default.browser`, set by the cross-browser matrix runner
+BROWSER_ENV_VAR = 'TEST_BROWSER'
+
+BROWSERS = ('chromium', 'firefox', 'webkit')
+
+# Environment variables overriding `default.slow_mo` and `default.headless`, set by the
+# benchmark so that its timings measure the pages rather than the simulated human pace
+SLOW_MO_ENV_VAR = 'TEST_SLOW_MO'
+HEADLESS_ENV_VAR = 'TEST_HEADLESS'
+
+# Environment variables overriding a setting of a section, set by the cross-browser matrix
+# runner so that the concurrent runs of the engines keep their own files
+SETTING_ENV_VARS = {
+    'TEST_LOG_FILE': ('logging', 'file'),
+    'TEST_WEB_VITALS_HISTORY': ('web_vitals', 'history'),
+    'TEST_HAR_DIRECTORY': ('har', 'directory'),
+}
+
+# Parsed and validated configurations by path, with the modification time they were read at
+_parsed = {}
+
+
+def validate_config(config, path=CONFIG_PATH):
+    """
+    Check the settings every part of the framework relies on.
+
+    Args:
+        config (dict): The parsed YAML configuration
+        path (str): Where it was read from, for the error messages
+
+    Raises:
+        ValueError: If a required setting is missing or has the wrong type
+    """
+    default = config.get('default') if isinstance(config, dict) else None
+    if not isinstance(default, dict):
+        raise ValueError(f"{path}: missing the 'default' section")
+    if not isinstance(default.get('base_url'), str):
+        raise ValueError(f"{path}: 'base_url' must be a URL")
+    if default.get('browser') not in BROWSERS:
+        raise ValueError(f"{path}: 'browser' must be one of {', '.join(BROWSERS)}")
+    for name in ('timeout', 'slow_mo'):
+        value = default.get(name)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            raise ValueError(f"{path}: '{name}' must be a positive number")
+    if not isinstance(default.get('headless'), bool):
+        raise ValueError(f"{path}: 'headless' must be True or False")
+    if not isinstance(default.get('opt_in_tags') or [], list):
+        raise ValueError(f"{path}: 'opt_in_tags' must be a list of tags")
+    for name, value in default.items():
+        if name not in ('base_url', 'browser', 'timeout', 'slow_mo', 'headless', 'retries', 'opt_in_tags') \
+                and value is not None and not isinstance(value, dict):
+            raise ValueError(f"{path}: the '{name}' section must be a mapping")
+
+
+def _parse(path):
+    with profile.measure('yaml import'):
+        import yaml  # Only needed the first time the file is read
+
+    with open(path, 'r') as config_file:
+        # The C loader, when PyYAML was built with it, is several times faster
+        config = yaml.load(config_file, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+    validate_config(config, path)
+    return config
+
+
+def load_config(path=CONFIG_PATH):
+    """
+    Loads the configuration from the YAML file.
+
+    The file is parsed and validated once per process, and again only when it changes.
+    Every call gets its own copy, so callers may modify it. The `TEST_BROWSER`
+    environment variable, when set, replaces the configured browser, `TEST_SLOW_MO` and
+    `TEST_HEADLESS` the slow motion delay and headless mode, and those of
+    `SETTING_ENV_VARS` the setting they name.
+
+    Args:
+        path (str): The configuration file, `config/config.yaml` by default
+
+    Returns:
+        dict: The loaded configuration data from the YAML file.
+
+    Raises:
+        ValueError: If the configuration is invalid.
+    """
+    with profile.measure('config loading'):
+        modified = os.stat(path).st_mtime_ns
+        cached = _parsed.get(path)
+        if cached is None or cached[0] != modified:
+            started = time.perf_counter()
+            cached = _parsed[path] = (modified, _parse(path))
+            profile.add('config parsing', (time.perf_counter() - started) * 1000)
+        config = copy.deepcopy(cached[1])
+    if os.environ.get(BROWSER_ENV_VAR):
+        config['default']['browser'] = os.environ[BROWSER_ENV_VAR]
+    if os.environ.get(SLOW_MO_ENV_VAR):
+        config['default']['slow_mo'] = float(os.environ[SLOW_MO_ENV_VAR])
+    if os.environ.get(HEADLESS_ENV_VAR):
+        config['default']['headless'] = os.environ[HEADLESS_ENV_VAR].lower() in ('1', 'true', 'yes')
+    for variable, (section, name) in SETTING_ENV_VARS.items():
+        if os.environ.get(variable):
+            config['default'][section] = {**(config['default'].get(section) or {}), name: os.environ[variable]}
+    return config
@@ -1,45 +1,639 @@
+import time
+
+# Taken before the framework is imported, for --profile-startup
+IMPORTS_STARTED = time.perf_counter()
+
+import html
+import json
+import os
+import re
+
 import pytest
-from config.browser_config import BrowserManager
-from playwright.sync_api import sync_playwright
+from config.browser_config import BrowserManager, HAR_MODES, load_config
+from config.context_pool import ContextPool
+from config.emulation import Throttling, profile_names
+from config.logger_config import setup_logger
+from utils.flight_recorder import FlightRecorder
+from utils.result_cache import ResultCache, scenario_key
+from utils.startup_profile import profile
+from utils.timing import instrument_playwright, recorder, slowest
+
+logger = setup_logger(__name__)
+profile.add('framework imports', (time.perf_counter() - IMPORTS_STARTED) * 1000)
+
+# Timing entries of every finished scenario, gathered from the test reports so that
+# the results of pytest-xdist workers end up on the controller
+SESSION_TIMINGS = []
+# Outcome and duration of every case of the data-driven location matrix
+LOCATION_RESULTS = []
+# Result cache keys of the scenarios that passed in this session, by node id
+PASSED_SCENARIO_KEYS = {}
+# Result cache keys of the scenarios skipped for a cached pass, by node id
+CACHED_SCENARIO_KEYS = {}
+step_timing_key = pytest.StashKey[dict]()
+flight_recorder_key = pytest.StashKey[FlightRecorder]()
+failure_artifacts_key = pytest.StashKey[dict]()
+result_cache_key = pytest.StashKey[ResultCache]()
+
+# Maps the `parallel.shard_by` setting to the pytest-xdist distribution mode
+SHARDING_MODES = {
+    'duration': 'worksteal',
+    'tag': 'loadgroup',
+    'file': 'loadfile',
+}
+
+
+def pytest_addoption(parser):
+    """
+    Registers the command line options of the framework.
+    """
+    parser.addoption(
+        '--har-mode', choices=HAR_MODES, default=None,
+        help="Record the site traffic of every scenario to HAR fixtures, or replay them offline "
+             "(overrides har.mode in config/config.yaml)",
+    )
+    parser.addoption(
+        '--timings-output', default=None,
+        help="Where to write the timings of the session (overrides timing.output in config/config.yaml)",
+    )
+    parser.addoption(
+        '--profile-startup', action='store_true', default=False,
+        help="Report the time spent in imports, collection, config loading and browser launch "
+             "(run without pytest-xdist workers to include the collection)",
+    )
+    parser.addoption(
+        '--force-run', action='store_true', default=False,
+        help="Run every scenario, including those with a cached pass (see result_cache in config/config.yaml)",
+    )
+
+
+def _har_settings(config):
+    """
+    Resolves the HAR mode and fixture directory, the command line taking precedence over `config.yaml`.
+
+    Returns:
+        tuple: The HAR mode (`off`, `record` or `replay`) and the directory holding the archives.
+    """
+    har = load_config()['default'].get('har') or {}
+    mode = config.getoption('--har-mode') or har.get('mode', 'off')
+    return mode, har.get('directory', 'fixtures/har')
+
+
+def _har_path(directory, node_name):
+    """
+    Builds the HAR archive path of a scenario from its test name.
+    """
+    return os.path.join(directory, re.sub(r'[^\w.-]+', '_', node_name) + '.zip')
+
+
+def _parallel_config():
+    """
+    Reads the parallel execution settings from the YAML configuration.
+
+    Returns:
+        dict: The `parallel` section of the default configuration, or an empty dict.
+    """
+    return load_config()['default'].get('parallel') or {}
+
+
+def _configured_workers(default):
+    """
+    Reads `parallel.workers` from the YAML configuration.
+
+    Returns:
+        The string `auto` or the number of workers as an int.
+
+    Raises:
+        pytest.UsageError: If the setting is neither `auto` nor a positive whole number.
+    """
+    workers = _parallel_config().get('workers', default)
+    if workers == 'auto':
+        return workers
+    if isinstance(workers, bool) or not re.fullmatch(r'[1-9]\d*', str(workers).strip()):
+        raise pytest.UsageError(f"parallel.workers must be 'auto' or a positive whole number, not {workers!r}")
+    return int(workers)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config):
+    """
+    Enables parallel execution from `config.yaml` when no worker count is given on the command line.
+
+    Runs before pytest-xdist processes its options, so `-n` and `--dist` passed explicitly
+    always win over the configuration file. Worker processes are left untouched.
+    """
+    if not config.pluginmanager.hasplugin('xdist') or hasattr(config, 'workerinput'):
+        return
+    parallel = _parallel_config()
+    if config.option.numprocesses is None:
+        workers = _configured_workers(1)
+        if workers == 'auto' or workers > 1:
+            config.option.numprocesses = workers
+    if config.option.numprocesses and config.option.dist == 'no':
+        shard_by = parallel.get('shard_by', 'duration')
+        if shard_by not in SHARDING_MODES:
+            raise pytest.UsageError(f"Unsupported parallel.shard_by value: {shard_by}")
+        config.option.dist = SHARDING_MODES[shard_by]
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    """
+    Resolves `-n auto` to the configured worker count, falling back to one worker per CPU.
+    """
+    workers = _configured_workers('auto')
+    if workers == 'auto' or workers <= 1:
+        return os.cpu_count() or 1
+    return workers
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection(session):
+    """
+    Times the whole collection for --profile-startup.
+    """
+    with profile.measure('collection'):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector):
+    """
+    Times the collection of every test module, which imports its steps and page objects
+    and parses its feature file, for --profile-startup.
+    """
+    if not isinstance(collector, pytest.Module):
+        yield
+        return
+    with profile.measure(f"collect {collector.nodeid}"):
+        yield
+
+
+def _skip_cached_passes(config, items):
+    """
+    Skips the scenarios whose result cache key already passed, unless `--force-run` is given.
+
+    The key hashes the scenario's node id and parameters, the feature files and project
+    modules of its test module, `config.yaml`, `conftest.py`, `pytest.ini`, `requirements.txt`,
+    the HAR fixture the scenario replays, the browser engine and the installed Playwright,
+    pytest and pytest-bdd versions. Every scenario carries its key in its user
+    properties so that a pass can be recorded wherever it ran; a skipped one is marked as
+    a cached pass.
+    """
+    cache = config.stash.get(result_cache_key, None)
+    if cache is None:
+        return
+    _, har_directory = _har_settings(config)
+    browser = load_config()['default']['browser']
+    root = str(config.rootpath)
+    for item in items:
+        # Scenarios on the module page replay the module's archive, the others their own
+        har_name = item.module.__name__ if 'module_page' in item.fixturenames else item.name
+        key = scenario_key(item, root, (
+            os.path.join(root, 'config', 'config.yaml'), os.path.join(root, 'conftest.py'),
+            os.path.join(root, 'pytest.ini'), os.path.join(root, 'requirements.txt'),
+            _har_path(os.path.join(root, har_directory), har_name),
+        ), browser)
+        item.user_properties.append(('result_cache_key', key))
+        if cache.has_passed(key) and not config.getoption('--force-run'):
+            item.user_properties.append(('cached_pass', True))
+            item.add_marker(pytest.mark.skip(reason=f"cached pass ({key[:12]})"))
+
+
+def _deselect_opt_in(config, items):
+    """
+    Leaves out the scenarios carrying one of the `opt_in_tags` of `config.yaml` unless the
+    marker expression given with `-m` names that tag, e.g. `pytest -m location_matrix`, so
+    that selecting a broader tag such as `filter_location` does not pull them in.
+    """
+    opt_in_tags = load_config()['default'].get('opt_in_tags') or []
+    names = set(re.findall(r'[\w-]+', config.option.markexpr or ''))
+    skipped_tags = [tag for tag in opt_in_tags if tag not in names]
+    deselected = [item for item in items if any(item.get_closest_marker(tag) for tag in skipped_tags)]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item not in deselected]
+
+
+def _check_emulation_tags(items):
+    """
+    Stops the session before any browser starts when an `@emulate_<profile>` tag names a
+    profile missing from `emulation.profiles` in `config.yaml`.
+    """
+    profiles = (load_config()['default'].get('emulation') or {}).get('profiles') or {}
+    unknown = [
+        f"{item.nodeid}: {name}"
+        for item in items
+        for name in profile_names(marker.name for marker in item.iter_markers())
+        if name not in profiles
+    ]
+    if unknown:
+        raise pytest.UsageError("Unknown emulation profiles, add them to emulation.profiles in config.yaml:\n"
+                                + "\n".join(unknown))
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Checks the emulation tags, leaves out the opt-in scenarios, skips the scenarios with a
+    cached pass, and pins scenarios that share a configured tag to the same worker when
+    sharding by tag.
+    """
+    _check_emulation_tags(items)
+    _deselect_opt_in(config, items)
+    _skip_cached_passes(config, items)
+    if config.getoption('dist', 'no') != 'loadgroup':
+        return
+    group_tags = _parallel_config().get('group_tags') or []
+    for item in items:
+        for tag in group_tags:
+            if item.get_closest_marker(tag):
+                item.add_marker(pytest.mark.xdist_group(name=tag))
+                break
+
+
+def _timing_config():
+    """
+    Reads the timing instrumentation settings from the YAML configuration.
+    """
+    return load_config()['default'].get('timing') or {}
+
+
+def _result_cache_config():
+    """
+    Reads the result cache settings from the YAML configuration.
+    """
+    return load_config()['default'].get('result_cache') or {}
+
+
+def pytest_configure(config):
+    """
+    Loads the result cache when enabled for a HAR replay run. Against the live site a
+    result can change without any change in the repository, so results are never cached then.
+    """
+    settings = _result_cache_config()
+    har_mode, _ = _har_settings(config)
+    if settings.get('enabled', False) and har_mode == 'replay' and getattr(config, 'cache', None) is not None:
+        config.stash[result_cache_key] = ResultCache(config.cache, settings.get('max_entries', 1000))
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    """
+    Attributes the timings recorded from now on, fixtures included, to the scenario.
+    """
+    recorder.scenario = item.nodeid
+
+
+def _failure_capture_config():
+    """
+    Reads the failure capture settings from the YAML configuration.
+    """
+    return load_config()['default'].get('failure_capture') or {}
+
+
+def _artifact_extras(config, artifacts):
+    """
+    Builds the pytest-html links to the failure artifacts of a scenario.
+
+    Args:
+        config: The pytest config.
+        artifacts (dict): Paths of the artifacts written by `FlightRecorder.dump`.
+
+    Returns:
+        list: pytest-html extras, empty when pytest-html is not active.
+    """
+    pytest_html = config.pluginmanager.getplugin('html')
+    if pytest_html is None:
+        return []
+    report_directory = os.path.dirname(os.path.abspath(config.option.htmlpath or '.'))
+    links = {name: os.path.relpath(os.path.abspath(path), report_directory) for name, path in artifacts.items()}
+    extras = [pytest_html.extras.image(links.pop('screenshot'))] if 'screenshot' in links else []
+    return extras + [pytest_html.extras.url(path, name=name) for name, path in links.items()]
+
+
+def _fail_retried_matrix_case(item, report):
+    """
+    Fails a location matrix case that only passed once a step was retried: every case
+    searches from the page the previous case left, so a retry there hides a wait that
+    read the previous location's results.
+    """
+    properties = dict(item.user_properties)
+    if report.when != 'call' or not report.passed or 'location' not in properties:
+        return
+    retries = [value for name, value in item.user_properties if name == 'step_retries']
+    if retries:
+        steps = ", ".join(f"{retry['step']} ({retry['retries']})" for retry in retries)
+        report.outcome = 'failed'
+        report.longrepr = f"Location {properties['location']} only passed after retrying: {steps}"
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Attaches the timings of the scenario to its teardown report, and links the
+    failure artifacts of a failed step from the pytest-html report.
+
+    The timings go in a `timings` attribute of the report, which pytest-xdist sends
+    to the controller, rather than in the user properties that JUnit XML writes out.
+    """
+    timings = recorder.take(item.nodeid) if call.when == 'teardown' else None
+    outcome = yield
+    report = outcome.get_result()
+    if timings is not None:
+        report.timings = timings
+    _fail_retried_matrix_case(item, report)
+    artifacts = item.stash.get(failure_artifacts_key, None)
+    if report.when == 'call' and artifacts:
+        report.extras = getattr(report, 'extras', []) + _artifact_extras(item.config, artifacts)
+
+
+def pytest_runtest_logreport(report):
+    """
+    Gathers the timings of every scenario and the result of every location matrix case,
+    wherever they ran.
+    """
+    if report.when == 'teardown':
+        SESSION_TIMINGS.extend(getattr(report, 'timings', None) or [])
+    for name, value in report.user_properties:
+        if name == 'result_cache_key':
+            if report.when == 'call' and report.passed:
+                PASSED_SCENARIO_KEYS[report.nodeid] = value
+            elif report.failed:
+                PASSED_SCENARIO_KEYS.pop(report.nodeid, None)
+            elif report.when == 'setup' and _is_cached_pass(report):
+                CACHED_SCENARIO_KEYS[report.nodeid] = value
+    if report.when == 'call' or (report.when == 'setup' and not report.passed):
+        for name, value in report.user_properties:
+            if name == 'location':
+                LOCATION_RESULTS.append({
+                    'location': value, 'outcome': report.outcome, 'duration_ms': round(report.duration * 1000, 1),
+                })
+
+
+def _is_cached_pass(report):
+    return report.skipped and ('cached_pass', True) in report.user_properties
+
+
+def pytest_report_teststatus(report, config):
+    """
+    Reports the scenarios skipped for a cached pass as `cached` rather than as plain skips.
+    """
+    if report.when == 'setup' and _is_cached_pass(report):
+        return 'cached', 'c', 'CACHED'
+
+
+def pytest_bdd_before_step(request, feature, scenario, step, step_func):
+    request.node.stash[step_timing_key] = recorder.start('step', step.name)
+
+
+def _report_step_retries(request, step, entry):
+    """
+    Adds the retries of a step made by `retry_step` to the scenario's report.
+    """
+    if entry['retries']:
+        request.node.user_properties.append(('step_retries', {'step': step.name, 'retries': entry['retries']}))
+        request.node.add_report_section('call', 'step retries', f"{step.name}: {entry['retries']} retries")
+
+
+def pytest_bdd_after_step(request, feature, scenario, step, step_func, step_func_args):
+    entry = request.node.stash[step_timing_key]
+    recorder.stop(entry)
+    _report_step_retries(request, step, entry)
+
+
+def pytest_bdd_step_error(request, feature, scenario, step, step_func, step_func_args, exception):
+    entry = request.node.stash[step_timing_key]
+    recorder.stop(entry, failed=True)
+    _report_step_retries(request, step, entry)
+    flight_recorder = request.node.stash.get(flight_recorder_key, None)
+    if flight_recorder:
+        request.node.stash[failure_artifacts_key] = flight_recorder.dump(
+            _failure_capture_config().get('directory', 'reports/failures'), request.node.nodeid
+        )
+
+
+def pytest_sessionfinish(session):
+    """
+    Records the passed scenarios in the result cache, refreshing the cached passes, and
+    writes the timings of the session to the JSON file configured in `config.yaml`.
+    """
+    if hasattr(session.config, 'workerinput'):
+        return
+    cache = session.config.stash.get(result_cache_key, None)
+    if cache is not None and (PASSED_SCENARIO_KEYS or CACHED_SCENARIO_KEYS):
+        for nodeid, key in {**CACHED_SCENARIO_KEYS, **PASSED_SCENARIO_KEYS}.items():
+            cache.record(key, nodeid)
+        cache.save()
+    if not SESSION_TIMINGS:
+        return
+    settings = _timing_config()
+    output = session.config.getoption('--timings-output') or settings.get('output', 'reports/timings.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as timings_file:
+        json.dump({
+            'slowest_steps': slowest(SESSION_TIMINGS, 'step', settings.get('slowest', 10)),
+            'slowest_page_methods': slowest(SESSION_TIMINGS, 'page', settings.get('slowest', 10)),
+            'locations': LOCATION_RESULTS,
+            'entries': SESSION_TIMINGS,
+        }, timings_file, indent=2)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """
+    Prints the startup profile when asked for, the results of the location matrix and
+    the slowest steps of the session.
+    """
+    if config.getoption('--profile-startup'):
+        terminalreporter.section('startup profile')
+        for row in profile.rows():
+            terminalreporter.write_line(f"{row['total_ms']:9.1f}ms {row['calls']:4d} calls  {row['phase']}")
+    if LOCATION_RESULTS:
+        terminalreporter.section('location matrix')
+        for result in sorted(LOCATION_RESULTS, key=lambda result: result['location']):
+            terminalreporter.write_line(
+                f"{result['outcome']:8} {result['duration_ms'] / 1000:7.2f}s  {result['location']}"
+            )
+        failed = sum(result['outcome'] != 'passed' for result in LOCATION_RESULTS)
+        terminalreporter.write_line(f"{len(LOCATION_RESULTS) - failed} locations passed, {failed} failed")
+    rows = slowest(SESSION_TIMINGS, 'step', _timing_config().get('slowest', 10))
+    if not rows:
+        return
+    terminalreporter.section('slowest steps')
+    for row in rows:
+        terminalreporter.write_line(
+            f"{row['total_ms'] / 1000:8.2f}s total {row['max_ms'] / 1000:7.2f}s max "
+            f"{row['wait_ms'] / 1000:7.2f}s waiting {row['calls']:3d} calls {row['retries']:2d} retries  {row['name']}"
+        )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    """
+    Adds the slowest steps and page methods to the pytest-html report.
+    """
+    limit = _timing_config().get('slowest', 10)
+    for kind, title in (('step', 'Slowest steps'), ('page', 'Slowest page methods')):
+        rows = slowest(SESSION_TIMINGS, kind, limit)
+        if not rows:
+            continue
+        cells = "".join(
+            f"<tr><td>{html.escape(row['name'])}</td><td>{row['calls']}</td><td>{row['total_ms'] / 1000:.2f}s</td>"
+            f"<td>{row['max_ms'] / 1000:.2f}s</td><td>{row['wait_ms'] / 1000:.2f}s</td><td>{row['retries']}</td></tr>"
+            for row in rows
+        )
+        postfix.append(
+            f"<h3>{title}</h3><table><tr><th>Name</th><th>Calls</th><th>Total</th><th>Max</th>"
+            f"<th>Waiting</th><th>Retries</th></tr>{cells}</table>"
+        )
+
 
 @pytest.fixture(scope="session")
-def browser_manager():
+def browser_manager(request):
     """
     Initializes the browser for the entire test session.
 
-    This fixture creates a browser for all the tests executed in a session.
-    It uses the previously defined `BrowserManager` class to manage the browser instance.
+    This fixture creates a `BrowserManager` for all the tests executed in a session.
+    When running in parallel, every pytest-xdist worker is its own session, so each
+    worker gets its own Playwright instance and browser. The Playwright calls of the
+    session are timed from then on when `timing.playwright_calls` is enabled.
+    Yields:
+        BrowserManager: The browser manager owning the Playwright browser.
+    After all tests are done, it closes the browser.
+    """
+    if _timing_config().get('playwright_calls', True):
+        # Instrumented here rather than at startup, so that Playwright is only imported once a browser is needed
+        request.config.add_cleanup(instrument_playwright())
+    try:
+        with profile.measure('browser launch'):
+            browser = BrowserManager()  # We use the class we have already created
+        yield browser
+        browser.close()  # Close the browser after all tests
+    except Exception as e:
+        print(f"Error: {e}")
+
+@pytest.fixture(scope="session")
+def browser_context(browser_manager):
+    """
+    Provides the browser context shared by the tests of a session (or of a worker).
+
+    Args:
+        browser_manager: The `BrowserManager` provided by the `browser_manager` fixture.
+
     Yields:
         context: A new browser context that can be used to generate pages.
-    After all tests are done, it closes both the context and the browser.
+    After all tests are done, it closes the context.
     """
     try:
-        browser = BrowserManager()  # We use the class we have already created
-        context = browser.new_context()
+        context = browser_manager.new_context()
         yield context  # Provide the browser context to the tests
         context.close()
-        browser.close()  # Close the browser after all tests
     except Exception as e:
         print(f"Error: {e}")
 
+@pytest.fixture(scope="session")
+def context_pool(browser_manager):
+    """
+    Provides the pool of warm browser contexts when `context_pool.enabled` is set.
+
+    Args:
+        browser_manager: The `BrowserManager` provided by the `browser_manager` fixture.
+
+    Yields:
+        ContextPool: The pool, or None when pooling is disabled.
+    After all tests are done, it closes the pooled contexts.
+    """
+    pool = ContextPool.from_config(browser_manager, load_config()['default'].get('context_pool'))
+    yield pool
+    if pool:
+        pool.close()
+
+@pytest.fixture(scope="module")
+def module_page(request, browser_manager):
+    """
+    Provides one browser page shared by all the tests of a module.
+
+    Data-driven modules run many cases on it so that the site is loaded once; their steps
+    reset the page state between cases. With HAR recording or replay enabled, the page
+    lives in a context bound to the module's archive in the HAR directory.
+
+    Args:
+        request: The pytest request of the module.
+        browser_manager: The `BrowserManager` provided by the `browser_manager` fixture.
+
+    Yields:
+        page: The browser page shared by the module.
+    After the last test of the module, its context is closed.
+    """
+    har_mode, har_directory = _har_settings(request.config)
+    context = browser_manager.new_context(
+        har_path=_har_path(har_directory, request.module.__name__), har_mode=har_mode
+    )
+    yield context.new_page()
+    browser_manager.resource_blockers.pop(context, None)
+    context.close()
+
 @pytest.fixture(scope="function")
-def page(browser_manager):
+def page(request, browser_manager):
     """
     Provides a new browser page for each test.
 
     This fixture generates a new browser page before each test and closes it after execution.
-    
+    With HAR recording or replay enabled, the page lives in a dedicated context bound to the
+    scenario's archive in the HAR directory, so that every scenario owns its own fixture.
+    Otherwise, with `context_pool.enabled`, the page of a warm pooled context is handed
+    out already on the homepage and the context is reset and returned to the pool afterwards.
+    The scenario tags are applied to the context's resource blocker, and the number of
+    blocked requests is logged and attached to the test report. With `failure_capture`
+    enabled, a `FlightRecorder` keeps the last events of the page for a failing step.
+    An `@emulate_<profile>` tag throttles the page's network and CPU to that profile.
+
     Args:
-        browser_manager: The browser context provided by the `browser_manager` fixture.
-    
+        request: The pytest request of the scenario.
+        browser_manager: The `BrowserManager` provided by the `browser_manager` fixture.
+
     Yields:
         page: A new browser page to be used in the test.
-    
+
     After the test, the page is automatically closed.
     """
+    har_mode, har_directory = _har_settings(request.config)
+    pooled = None
+    if har_mode != 'off':
+        context = browser_manager.new_context(
+            har_path=_har_path(har_directory, request.node.name), har_mode=har_mode
+        )
+    else:
+        pool = request.getfixturevalue('context_pool')
+        pooled = pool.acquire() if pool else None
+        context = pooled.context if pooled else request.getfixturevalue('browser_context')
+    tags = [marker.name for marker in request.node.iter_markers()]
+    blocker = browser_manager.resource_blockers.get(context)
+    if blocker:
+        blocker.apply_tags(tags)
+    page = pooled.page if pooled else context.new_page()
+    flight_recorder = FlightRecorder.from_config(page, _failure_capture_config())
+    if flight_recorder:
+        request.node.stash[flight_recorder_key] = flight_recorder
+    # The profiles of the tags were checked at collection
+    throttling = Throttling.from_tags(page, tags, (load_config()['default'].get('emulation') or {}).get('profiles'))
+    if throttling and throttling.apply():
+        request.node.user_properties.append(('emulation', throttling.description))
+        request.node.add_report_section('setup', 'emulation', throttling.description)
+    yield page  # Provide the page to the functions that need it
+    if throttling:
+        throttling.clear()
+    if flight_recorder:
+        flight_recorder.close()
     try:
-        page = browser_manager.new_page()
-        yield page  # Provide the page to the functions that need it
-        page.close()  # Close the page after each test
+        if not pooled:
+            page.close()  # Close the page after each test
     except Exception as e:
         print(f"Error: {e}")
+    if blocker:
+        logger.info(f"{request.node.name}: {blocker.summary()}.")
+        request.node.user_properties.append(('blocked_requests', sum(blocker.blocked.values())))
+    if pooled:
+        pool.release(pooled)
+    if har_mode != 'off':
+        browser_manager.resource_blockers.pop(context, None)
+        context.close()  # Closing the context writes the recording to disk
@@ -0,0 +1,70 @@
+"""
+The scenarios of `search_and_filters.feature` written as asyncio flows.
+
+Each flow drives an `AsyncHomePage` through the same steps as its scenario so that
+they can run concurrently with `features.async_runner`.
+"""
+
+
+async def tc01_single_location(home_page):
+    """TC-01 Verify the user can select a specific location and show correct data."""
+    await home_page.navigate()
+    await home_page.click_on_wherever_button()
+    await home_page.select_location("New York")
+    await home_page.click_on_search_button()
+    await home_page.verify_city_is_selected("New York")
+    await home_page.verify_all_cities_are_correct()
+    await home_page.verify_number_of_properties()
+
+
+async def tc02_multiple_locations(home_page):
+    """TC-02 Verify the user can select more than one location and show correct data."""
+    await home_page.navigate()
+    await home_page.click_on_wherever_button()
+    await home_page.select_location("New York")
+    await home_page.select_location("Texas")
+    await home_page.click_on_search_button()
+    await home_page.verify_cities_are_selected("New York", "Texas")
+    await home_page.verify_all_the_cities_are_correct()
+
+
+async def tc03_exact_dates(home_page):
+    """TC-03 Verify the user can select available dates and the results make sense."""
+    await home_page.navigate()
+    await home_page.click_on_whenever_button()
+    await home_page.select_dates("13", "16")
+    await home_page.click_on_search_button()
+    await home_page.verify_filter_date_is_correct()
+    await home_page.verify_correct_date_of_the_results()
+
+
+async def tc04_guests(home_page):
+    """TC-04 Verify the results show properties for the selected number of guests."""
+    await home_page.navigate()
+    await home_page.click_on_wherever_button()
+    await home_page.select_location("New York")
+    await home_page.click_on_whoever_button()
+    await home_page.click_on_plus_button_in_whoever("6")
+    await home_page.click_on_search_button()
+    await home_page.verify_city_is_selected("New York")
+    await home_page.verify_amount_of_guests_selected("6")
+    await home_page.verify_guests_number()
+
+
+async def tc06_search_link(home_page):
+    """TC-06 Verify the results of a location search opened from a search link."""
+    await home_page.apply_filters(locations=["New York"])
+    await home_page.verify_all_cities_are_correct()
+    await home_page.verify_number_of_properties()
+
+
+# Flows that only run when named, like the `opt_in_tags` scenarios of the suite
+OPT_IN_FLOWS = ('TC-06',)
+
+SCENARIO_FLOWS = {
+    'TC-01': tc01_single_location,
+    'TC-02': tc02_multiple_locations,
+    'TC-03': tc03_exact_dates,
+    'TC-04': tc04_guests,
+    'TC-06': tc06_search_link,
+}
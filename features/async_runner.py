@@ -0,0 +1,174 @@
+"""
+Runs scenario flows concurrently on a single browser.
+
+Every flow runs as an asyncio task in its own browser context, and a semaphore caps
+how many run at once. Usage:
+
+    python -m features.async_runner                      # All scenarios once
+    python -m features.async_runner TC-01 TC-04 --repeat 5 --concurrency 8
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Optional
+
+from config.async_browser_config import AsyncBrowserManager
+from config.browser_config import HAR_MODES, load_config
+from config.logger_config import setup_logger
+from features.async_flows import OPT_IN_FLOWS, SCENARIO_FLOWS
+from features.pages.async_home_page import AsyncHomePage
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class ScenarioResult:
+    """
+    Outcome of one flow run.
+
+    Attributes:
+        name (str): Name of the scenario run
+        passed (bool): Whether the flow completed without error
+        duration (float): Wall time of the flow in seconds
+        error (str): Formatted traceback when the flow failed
+    """
+    name: str
+    passed: bool
+    duration: float
+    error: Optional[str] = None
+
+
+def default_har_directory():
+    """
+    Where the HAR archives are stored, from `har.directory` in config.yaml.
+    """
+    return (load_config()['default'].get('har') or {}).get('directory', 'fixtures/har')
+
+
+def har_path(har_directory, name):
+    """
+    Path of the HAR archive of a flow run, shared by every run of the same scenario,
+    so a scenario can only be recorded by one run at a time (see `run_scenarios`).
+
+    Args:
+        har_directory (str): Where the per-scenario HAR archives are stored
+        name (str): Name of the run, e.g. `TC-01#3`
+
+    Returns:
+        str: The archive path
+    """
+    return os.path.join(har_directory, f"async_{name.split('#')[0]}.zip")
+
+
+async def run_flow(manager, name, flow, semaphore, har_path=None, har_mode='off'):
+    """
+    Run one flow in a fresh context once a concurrency slot is free.
+
+    Args:
+        manager (AsyncBrowserManager): The manager owning the shared browser
+        name (str): Name reported for the run
+        flow (Callable): Coroutine function taking an `AsyncHomePage`
+        semaphore (asyncio.Semaphore): Caps the number of flows running at once
+        har_path (str): HAR archive of the scenario when recording or replaying
+        har_mode (str): One of `off`, `record` or `replay`
+
+    Returns:
+        ScenarioResult: The outcome of the flow
+    """
+    async with semaphore:
+        started = time.perf_counter()
+        context = None
+        try:
+            context = await manager.new_context(har_path=har_path, har_mode=har_mode)
+            page = await context.new_page()
+            await flow(AsyncHomePage(page, base_url=manager.base_url))
+            result = ScenarioResult(name, True, time.perf_counter() - started)
+        except Exception:
+            result = ScenarioResult(name, False, time.perf_counter() - started, traceback.format_exc())
+        finally:
+            if context:
+                await manager.close_context(context)
+        logger.info(f"{name} {'passed' if result.passed else 'failed'} in {result.duration:.2f}s.")
+        return result
+
+
+async def run_scenarios(flows, max_concurrency=None, har_mode='off', har_directory=None):
+    """
+    Run flows concurrently as tasks sharing one browser.
+
+    Args:
+        flows (list[tuple[str, Callable]]): Names and coroutine functions to run
+        max_concurrency (int): Maximum number of flows running at once,
+            defaults to `async_runner.max_concurrency` from config.yaml
+        har_mode (str): One of `off`, `record` or `replay`
+        har_directory (str): Where the per-scenario HAR archives are stored,
+            defaults to `har.directory` from config.yaml
+
+    Returns:
+        list[ScenarioResult]: The outcome of every flow, in the order given
+
+    Raises:
+        ValueError: If a scenario would be recorded by more than one run, each
+            overwriting the archive of the others
+    """
+    if har_mode == 'record':
+        scenarios = [name.split('#')[0] for name, _ in flows]
+        repeated = sorted({scenario for scenario in scenarios if scenarios.count(scenario) > 1})
+        if repeated:
+            raise ValueError(f"Recording needs a single run per scenario, {', '.join(repeated)} run more than once")
+    har_directory = har_directory or default_har_directory()
+    if max_concurrency is None:
+        settings = load_config()['default'].get('async_runner') or {}
+        max_concurrency = settings.get('max_concurrency', 4)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    manager = await AsyncBrowserManager.start()
+    try:
+        return await asyncio.gather(*(
+            run_flow(
+                manager, name, flow, semaphore,
+                har_path=har_path(har_directory, name),
+                har_mode=har_mode,
+            )
+            for name, flow in flows
+        ))
+    finally:
+        await manager.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the search scenarios concurrently on one browser.")
+    parser.add_argument('scenarios', nargs='*',
+                        help=f"Scenarios to run among {', '.join(SCENARIO_FLOWS)} (default: all but {', '.join(OPT_IN_FLOWS)})")
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help="Maximum number of scenarios running at once")
+    parser.add_argument('--repeat', type=int, default=1, help="Number of runs of every scenario")
+    parser.add_argument('--har-mode', choices=HAR_MODES, default='off',
+                        help="Record or replay the HAR fixtures of every scenario")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.scenarios) - set(SCENARIO_FLOWS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    if args.har_mode == 'record' and args.repeat > 1:
+        parser.error("--har-mode record needs a single run per scenario, without --repeat")
+    names = args.scenarios or [name for name in SCENARIO_FLOWS if name not in OPT_IN_FLOWS]
+    flows = [(f"{name}#{run + 1}", SCENARIO_FLOWS[name]) for run in range(args.repeat) for name in names]
+    started = time.perf_counter()
+    results = asyncio.run(run_scenarios(flows, args.concurrency, har_mode=args.har_mode))
+    elapsed = time.perf_counter() - started
+
+    for result in results:
+        print(f"{'PASSED' if result.passed else 'FAILED'}  {result.name:<10} {result.duration:7.2f}s")
+        if result.error:
+            print(result.error)
+    failed = sum(not result.passed for result in results)
+    print(f"{len(results) - failed} passed, {failed} failed in {elapsed:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
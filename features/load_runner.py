@@ -0,0 +1,189 @@
+"""
+Generates load by replaying the scenario flows as concurrent virtual users.
+
+Every virtual user runs the selected flows one after the other, each in a fresh
+browser context of a single shared browser, until the test duration is over. Users
+are started one by one over the ramp-up period. Search latency (the search click
+until the properties are rendered) percentiles, error rate and throughput are
+printed and written to JSON. Point it at the HAR replay or at a stand-in server to
+run it offline. Usage:
+
+    python -m features.load_runner --users 20 --ramp-up 30 --duration 120
+    python -m features.load_runner --har-mode replay               # Offline, against the recordings
+    python -m features.load_runner --base-url http://localhost:8000 TC-01
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+from config.async_browser_config import AsyncBrowserManager
+from config.browser_config import load_config
+from config.logger_config import setup_logger
+from features.async_flows import OPT_IN_FLOWS, SCENARIO_FLOWS
+from features.async_runner import default_har_directory, har_path, run_flow
+from utils.timing import recorder
+
+logger = setup_logger(__name__)
+
+# Page method whose duration is reported as the search latency
+SEARCH_ACTION = 'AsyncHomePage.click_on_search_button'
+
+
+async def virtual_user(manager, user, flows, start_delay, deadline, results, har_mode='off', har_directory=None):
+    """
+    Run flows one after the other as one user until the deadline.
+
+    Args:
+        manager (AsyncBrowserManager): The manager owning the shared browser
+        user (int): Number of the user, also spreading the users over the flows
+        flows (list[tuple[str, Callable]]): Names and coroutine functions to cycle through
+        start_delay (float): Seconds to wait before starting, for the ramp-up
+        deadline (float): `time.monotonic()` value after which no new flow starts
+        results (list[ScenarioResult]): Where the outcome of every flow is appended
+        har_mode (str): One of `off` or `replay`
+        har_directory (str): Where the per-scenario HAR archives are stored
+    """
+    await asyncio.sleep(start_delay)
+    own_slot = asyncio.Semaphore(1)
+    iteration = 0
+    while time.monotonic() < deadline:
+        name, flow = flows[(user + iteration) % len(flows)]
+        iteration += 1
+        results.append(await run_flow(
+            manager, f"{name}#vu{user + 1}.{iteration}", flow, own_slot,
+            har_path=har_path(har_directory, name), har_mode=har_mode,
+        ))
+
+
+async def run_load(flows, users, ramp_up, duration, har_mode='off', har_directory=None, base_url=None):
+    """
+    Run the virtual users against one shared browser.
+
+    Args:
+        flows (list[tuple[str, Callable]]): Names and coroutine functions the users cycle through
+        users (int): Number of concurrent virtual users
+        ramp_up (float): Seconds over which the users are started
+        duration (float): Seconds after the first start during which new flows are started
+        har_mode (str): One of `off` or `replay`; the users run every scenario many times
+            at once, so they cannot record it
+        har_directory (str): Where the per-scenario HAR archives are stored,
+            defaults to `har.directory` from config.yaml
+        base_url (str): Site to load, defaults to `base_url` from config.yaml
+
+    Returns:
+        tuple[list[ScenarioResult], float]: The outcome of every flow and the elapsed seconds
+
+    Raises:
+        ValueError: If there is no user, the duration is not positive or `har_mode` is `record`
+    """
+    if users < 1 or duration <= 0:
+        raise ValueError(f"The load needs at least one user and a positive duration, got {users} users for {duration}s")
+    if har_mode == 'record':
+        raise ValueError("Virtual users cannot record HAR archives, record them with features.async_runner")
+    har_directory = har_directory or default_har_directory()
+    manager = await AsyncBrowserManager.start()
+    if base_url:
+        manager.base_url = base_url
+    results = []
+    started = time.monotonic()
+    try:
+        await asyncio.gather(*(
+            virtual_user(manager, user, flows, ramp_up * user / users, started + duration, results,
+                         har_mode=har_mode, har_directory=har_directory)
+            for user in range(users)
+        ))
+    finally:
+        await manager.close()
+    return results, time.monotonic() - started
+
+
+def percentiles(durations):
+    """
+    Summarize latencies.
+
+    Args:
+        durations (list[float]): Durations in milliseconds
+
+    Returns:
+        dict: `count`, `p50_ms`, `p90_ms`, `p95_ms`, `p99_ms` and `max_ms`, empty without durations
+    """
+    if not durations:
+        return {}
+    cuts = statistics.quantiles(durations, n=100, method='inclusive') if len(durations) > 1 else durations * 99
+    return {
+        'count': len(durations),
+        'p50_ms': round(cuts[49], 1), 'p90_ms': round(cuts[89], 1),
+        'p95_ms': round(cuts[94], 1), 'p99_ms': round(cuts[98], 1),
+        'max_ms': round(max(durations), 1),
+    }
+
+
+def main(argv=None):
+    settings = load_config()['default'].get('load') or {}
+    parser = argparse.ArgumentParser(description="Replay the search scenarios as concurrent virtual users.")
+    parser.add_argument('scenarios', nargs='*',
+                        help=f"Scenarios the users cycle through among {', '.join(SCENARIO_FLOWS)} "
+                             f"(default: load.scenarios from config.yaml)")
+    parser.add_argument('--users', type=int, default=settings.get('users', 10), help="Concurrent virtual users")
+    parser.add_argument('--ramp-up', type=float, default=settings.get('ramp_up', 30),
+                        help="Seconds over which the users are started")
+    parser.add_argument('--duration', type=float, default=settings.get('duration', 120),
+                        help="Seconds during which new flows are started")
+    parser.add_argument('--har-mode', choices=('off', 'replay'), default='off',
+                        help="Replay the HAR fixtures of every scenario to run offline")
+    parser.add_argument('--base-url', default=None, help="Site to load, e.g. a local stand-in server")
+    args = parser.parse_args(argv)
+    # Checked after parsing so that the defaults of config.yaml are checked too
+    if args.users < 1:
+        parser.error(f"--users must be at least 1, got {args.users}")
+    if args.duration <= 0:
+        parser.error(f"--duration must be more than 0 seconds, got {args.duration}")
+    if args.ramp_up < 0:
+        parser.error(f"--ramp-up cannot be negative, got {args.ramp_up}")
+
+    names = args.scenarios or settings.get('scenarios') or [name for name in SCENARIO_FLOWS if name not in OPT_IN_FLOWS]
+    unknown = set(names) - set(SCENARIO_FLOWS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    flows = [(name, SCENARIO_FLOWS[name]) for name in names]
+    results, elapsed = asyncio.run(run_load(
+        flows, args.users, args.ramp_up, args.duration, har_mode=args.har_mode, base_url=args.base_url,
+    ))
+
+    searches = [entry['duration_ms'] for entry in recorder.take(None)
+                if entry['kind'] == 'page' and entry['name'] == SEARCH_ACTION and not entry['failed']]
+    failed = sum(not result.passed for result in results)
+    summary = {
+        'users': args.users, 'ramp_up_s': args.ramp_up, 'duration_s': args.duration,
+        'elapsed_s': round(elapsed, 2),
+        'flows': len(results), 'failed_flows': failed,
+        'error_rate': round(failed / len(results), 4) if results else 0.0,
+        'flows_per_s': round(len(results) / elapsed, 3) if elapsed else 0.0,
+        'searches_per_s': round(len(searches) / elapsed, 3) if elapsed else 0.0,
+        'search_latency': percentiles(searches),
+        'flow_latency': percentiles([result.duration * 1000 for result in results if result.passed]),
+    }
+    output = settings.get('output', 'reports/load.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as output_file:
+        json.dump(summary, output_file, indent=2)
+
+    print(f"{len(results)} flows by {args.users} users in {elapsed:.1f}s: "
+          f"{summary['flows_per_s']} flows/s, {summary['searches_per_s']} searches/s, "
+          f"{summary['error_rate']:.1%} errors")
+    for name, stats in (('Search', summary['search_latency']), ('Flow', summary['flow_latency'])):
+        if not stats:
+            print(f"{name} latency: no {name.lower()} completed")
+        else:
+            print(f"{name} latency: p50 {stats['p50_ms']}ms  p90 {stats['p90_ms']}ms  p95 {stats['p95_ms']}ms  "
+                  f"p99 {stats['p99_ms']}ms  max {stats['max_ms']}ms  ({stats['count']} samples)")
+    print(f"Results written to {output}.")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Runs the feature files on several browser engines at the same time.
+
+Every engine gets its own pytest process, and so its own `BrowserManager`, with the
+browser picked through the `TEST_BROWSER` environment variable. Each run writes its
+pytest-html report, JUnit XML, timings, log file, web vitals history and pytest cache
+to `<output>/<engine>/`, and so do its HAR archives when recording, so the runs never
+write to the same file. The outcome and duration of every scenario on every engine are
+combined into `<output>/matrix.html` and `<output>/matrix.json`. Usage:
+
+    python -m features.matrix_runner                          # Engines of matrix.browsers
+    python -m features.matrix_runner --browsers chromium webkit -- -m filter_location
+"""
+import argparse
+import html
+import json
+import os
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ElementTree
+
+from config.settings import BROWSER_ENV_VAR, BROWSERS, load_config
+
+
+def is_recording(pytest_args):
+    """
+    Whether the runs record HAR archives, from `--har-mode` or else `har.mode` in config.yaml.
+
+    Args:
+        pytest_args (list[str]): Extra arguments passed to pytest
+    """
+    mode = (load_config()['default'].get('har') or {}).get('mode', 'off')
+    for index, arg in enumerate(pytest_args):
+        if arg == '--har-mode' and index + 1 < len(pytest_args):
+            mode = pytest_args[index + 1]
+        elif arg.startswith('--har-mode='):
+            mode = arg.split('=', 1)[1]
+    return mode == 'record'
+
+
+def start_run(browser, output, pytest_args):
+    """
+    Start the pytest run of one engine in its own process.
+
+    Args:
+        browser (str): The engine to run on
+        output (str): Directory of the matrix results
+        pytest_args (list[str]): Extra arguments passed to pytest
+
+    Returns:
+        subprocess.Popen: The running pytest process
+    """
+    directory = os.path.join(output, browser)
+    os.makedirs(directory, exist_ok=True)
+    command = [
+        sys.executable, '-m', 'pytest',
+        f"--html={os.path.join(directory, 'report.html')}", '--self-contained-html',
+        f"--junitxml={os.path.join(directory, 'junit.xml')}", '-o', f"junit_suite_name={browser}",
+        f"--timings-output={os.path.join(directory, 'timings.json')}",
+        '-o', f"cache_dir={os.path.join(directory, '.pytest_cache')}",
+        *pytest_args,
+    ]
+    env = {
+        **os.environ,
+        BROWSER_ENV_VAR: browser,
+        'TEST_LOG_FILE': os.path.join(directory, 'logs', 'test_log.jsonl'),
+        'TEST_WEB_VITALS_HISTORY': os.path.join(directory, 'web_vitals.jsonl'),
+    }
+    if is_recording(pytest_args):
+        # Replays only read the shared fixtures, recordings would overwrite each other
+        env['TEST_HAR_DIRECTORY'] = os.path.join(directory, 'har')
+    log_file = open(os.path.join(directory, 'pytest.log'), 'w')
+    process = subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT, env=env)
+    process.log_file = log_file
+    return process
+
+
+def read_results(junit_path):
+    """
+    Read the outcome and duration of every scenario from a JUnit XML report.
+
+    Args:
+        junit_path (str): Path of the report
+
+    Returns:
+        dict: `outcome` (passed, failed, error or skipped) and `duration` in seconds per scenario
+    """
+    if not os.path.exists(junit_path):
+        return {}
+    results = {}
+    for case in ElementTree.parse(junit_path).getroot().iter('testcase'):
+        outcome = 'passed'
+        for child, name in (('failure', 'failed'), ('error', 'error'), ('skipped', 'skipped')):
+            if case.find(child) is not None:
+                outcome = name
+        results[case.get('name')] = {'outcome': outcome, 'duration': float(case.get('time', 0))}
+    return results
+
+
+def read_slowest_steps(timings_path):
+    """
+    Read the slowest steps of a run from its timings file.
+
+    Args:
+        timings_path (str): Path of the timings written by the run
+
+    Returns:
+        list[dict]: The slowest steps, empty when the run wrote no timings
+    """
+    if not os.path.exists(timings_path):
+        return []
+    with open(timings_path) as timings_file:
+        return json.load(timings_file).get('slowest_steps', [])
+
+
+def write_report(output, engines):
+    """
+    Write the combined results of every engine as JSON and as an HTML table.
+
+    Args:
+        output (str): Directory of the matrix results
+        engines (dict): Per engine, `exit_code`, `wall_time`, the `scenarios` results and `slowest_steps`
+    """
+    with open(os.path.join(output, 'matrix.json'), 'w') as json_file:
+        json.dump(engines, json_file, indent=2)
+
+    scenarios = sorted({name for engine in engines.values() for name in engine['scenarios']})
+    header = "".join(f"<th>{html.escape(browser)}</th>" for browser in engines)
+    rows = []
+    for name in scenarios:
+        cells = []
+        for engine in engines.values():
+            result = engine['scenarios'].get(name)
+            cells.append(f"<td class='{result['outcome']}'>{result['outcome']} {result['duration']:.2f}s</td>"
+                         if result else "<td>-</td>")
+        rows.append(f"<tr><td>{html.escape(name)}</td>{''.join(cells)}</tr>")
+    totals = "".join(
+        f"<td>{sum(r['outcome'] == 'passed' for r in engine['scenarios'].values())}/{len(engine['scenarios'])} "
+        f"passed in {engine['wall_time']:.2f}s</td>"
+        for engine in engines.values()
+    )
+    with open(os.path.join(output, 'matrix.html'), 'w') as html_file:
+        html_file.write(
+            "<html><head><title>Cross-browser matrix</title><style>"
+            "td, th {padding: 4px 12px; text-align: left} .passed {color: green} "
+            ".failed, .error {color: red} .skipped {color: gray}</style></head><body>"
+            f"<h1>Cross-browser matrix</h1><table><tr><th>Scenario</th>{header}</tr>{''.join(rows)}"
+            f"<tr><th>Total</th>{totals}</tr></table>"
+            + "".join(f"<p><a href='{browser}/report.html'>{browser} report</a></p>" for browser in engines)
+            + "</body></html>"
+        )
+
+
+def main(argv=None):
+    settings = load_config()['default'].get('matrix') or {}
+    parser = argparse.ArgumentParser(description="Run the feature files on several browser engines at once.")
+    parser.add_argument('--browsers', nargs='+', default=settings.get('browsers', list(BROWSERS)),
+                        help=f"Engines to run on among {', '.join(BROWSERS)}")
+    parser.add_argument('--output', default=settings.get('output', 'reports/matrix'),
+                        help="Directory of the per-engine and combined results")
+    args, pytest_args = parser.parse_known_args(argv)
+    unknown = set(args.browsers) - set(BROWSERS)
+    if unknown:
+        parser.error(f"unknown browsers: {', '.join(sorted(unknown))}")
+    pytest_args = [arg for arg in pytest_args if arg != '--']
+
+    started = time.perf_counter()
+    running = {browser: start_run(browser, args.output, pytest_args) for browser in args.browsers}
+    finished = {}
+    while running:
+        for browser, process in list(running.items()):
+            if process.poll() is not None:
+                process.log_file.close()
+                finished[browser] = (process.returncode, time.perf_counter() - started)
+                del running[browser]
+        time.sleep(0.2)
+    engines = {
+        browser: {
+            'exit_code': finished[browser][0],
+            'wall_time': round(finished[browser][1], 2),
+            'scenarios': read_results(os.path.join(args.output, browser, 'junit.xml')),
+            'slowest_steps': read_slowest_steps(os.path.join(args.output, browser, 'timings.json')),
+        }
+        for browser in args.browsers
+    }
+    write_report(args.output, engines)
+
+    for browser, engine in engines.items():
+        passed = sum(result['outcome'] == 'passed' for result in engine['scenarios'].values())
+        print(f"{browser:<10} {passed}/{len(engine['scenarios'])} passed  {engine['wall_time']:7.2f}s"
+              f"  (exit code {engine['exit_code']})")
+    print(f"Matrix finished in {time.perf_counter() - started:.2f}s, "
+          f"see {os.path.join(args.output, 'matrix.html')}")
+    return 1 if any(engine['exit_code'] for engine in engines.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,413 @@
+from typing import TYPE_CHECKING, AsyncIterator
+
+from config.browser_config import load_config
+from config.logger_config import setup_logger
+from config.selectors.home_page_selectors import HomePageButtonSelectors, HomePageResultSelectors
+from features.pages.home_page import city_selector, expected_filter_dates, search_url
+from features.pages.network_results import AsyncSearchResponseCollector, spot_check
+from features.pages.property_card import (
+    CARD_SELECTORS, EXTRACT_PROPERTY_CARDS_SCRIPT, PROPERTY_LIST_SETTLED_SCRIPT, SCROLL_PROPERTY_LIST_SCRIPT,
+    VIEWPORT_RENDERED_SCRIPT, WATCH_PROPERTY_LIST_SCRIPT, PropertyCard,
+    check_dates, check_guests, check_locations, check_property_count,
+)
+from features.pages.results_snapshot import ResultsSnapshot
+from utils.readiness import AsyncReadinessEngine, Readiness, requires
+from utils.timing import recorder, timed_methods
+from utils.utils import async_scroll_to_city
+from utils.web_vitals import AsyncWebVitals
+
+logger = setup_logger(__name__)
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+
+def expect(actual):
+    """
+    Playwright's asyncio `expect`, imported on first use like in `home_page`.
+    """
+    from playwright.async_api import expect as playwright_expect
+    return playwright_expect(actual)
+
+
+@timed_methods
+class AsyncHomePage:
+    """
+    The asyncio counterpart of `HomePage`.
+    Exposes the same methods as coroutines so that many scenarios can drive
+    their own page concurrently from a single event loop; `tests/test_home_page_parity.py`
+    keeps the two in step.
+    """
+
+    def __init__(self, page: 'Page', base_url: str = None):
+        """
+        Initialize AsyncHomePage with an asyncio Playwright page object.
+
+        Args:
+            page (Page): The asyncio Playwright page instance to interact with
+            base_url (str): URL of the homepage, defaults to `base_url` from config.yaml
+        """
+        config = load_config()['default']
+        self.page = page
+        self.base_url = base_url or config['base_url']
+        self.readiness = AsyncReadinessEngine(page)
+        self.web_vitals = AsyncWebVitals.from_config(page, config.get('web_vitals'))
+        self.deep_link = config.get('deep_link') or {}
+        self.streaming = config.get('streaming') or {}
+        self.verification = config.get('verification') or {}
+        self.search_responses = None
+        if self.verification.get('source', 'dom') == 'network':
+            self.search_responses = AsyncSearchResponseCollector(
+                page, (config.get('readiness') or {}).get('search_response_url'),
+                self.verification.get('records_path'), self.verification.get('fields') or {},
+            )
+        self.snapshot = None
+        self.filters = {}
+        self.selected_city = None
+        self.data = []
+        logger.info("Initialized AsyncHomePage object.")
+
+    async def navigate(self):
+        """Navigate to the Wander website homepage."""
+        logger.info(f"Navigating to Wander homepage: {self.base_url}.")
+        if self.web_vitals:
+            await self.web_vitals.install()
+        await self.page.goto(self.base_url, wait_until='domcontentloaded')
+        await self.readiness.wait_for(Readiness.SEARCH_BAR_READY)
+        if self.web_vitals:
+            await self.web_vitals.measure('navigation')
+
+    async def close(self):
+        """Stop listening to the page."""
+        self.readiness.close()
+        if self.search_responses:
+            self.search_responses.close()
+
+    @requires(Readiness.SEARCH_BAR_READY)
+    async def click_on_wherever_button(self):
+        """Click the 'Wherever' button to open location selection."""
+        wherever_button = HomePageButtonSelectors.BUTTON_WHEREVER.value
+        await self.page.get_by_role(wherever_button[0], name=wherever_button[1]).click()
+        logger.info("Clicking 'Wherever' button.")
+
+    @requires(Readiness.SEARCH_BAR_READY)
+    async def click_on_whenever_button(self):
+        """Click the 'Whenever' button to open date selection."""
+        whenever_button = HomePageButtonSelectors.BUTTON_WHENEVER.value
+        await self.page.get_by_role(whenever_button[0], name=whenever_button[1]).click()
+        logger.info("Clicking 'Whenever' button.")
+
+    @requires(Readiness.SEARCH_BAR_READY)
+    async def click_on_whoever_button(self):
+        """Click the 'Whoever' button to open guest selection."""
+        whoever_button = HomePageButtonSelectors.BUTTON_WHOEVER.value
+        await self.page.get_by_role(whoever_button[0], name=whoever_button[1]).click()
+        logger.info("Clicking 'Whoever' button.")
+
+    async def click_on_search_button(self):
+        """
+        Click the search button and wait for results to load.
+        Ensures that property listings are visible before proceeding.
+        """
+        logger.info("Clicking search button.")
+        search_button = HomePageButtonSelectors.BUTTON_SEARCH.value
+        if self.search_responses:
+            self.search_responses.reset()
+        search_started = await self.web_vitals.mark() if self.web_vitals else None
+        async with self.readiness.after(Readiness.SEARCH_RESULTS_RESPONDED):
+            await self.page.locator(search_button[1]).click()
+        logger.info("Waiting for properties to be displayed.")
+        await self.readiness.wait_for(Readiness.PROPERTIES_RENDERED)
+        if self.web_vitals:
+            await self.web_vitals.measure('search', since=search_started)
+        if self.verification.get('source') == 'snapshot':
+            await self.capture_snapshot()
+
+    async def apply_filters(self, locations=None, dates=None, guests=None):
+        """
+        Open the search results with the filters already applied through a search URL.
+
+        Args:
+            locations (list[str]): City names to filter on
+            dates (tuple[str, str]): Check-in and check-out days of the month
+            guests (str): Number of guests
+        """
+        url = search_url(self.base_url, self.deep_link, locations, dates, guests)
+        logger.info(f"Opening search results: {url}.")
+        if self.search_responses:
+            self.search_responses.reset()
+        if self.web_vitals:
+            await self.web_vitals.install()
+        async with self.readiness.after(Readiness.SEARCH_RESULTS_RESPONDED):
+            await self.page.goto(url, wait_until='domcontentloaded')
+        await self.readiness.wait_for(Readiness.PROPERTIES_RENDERED)
+        if self.web_vitals:
+            await self.web_vitals.measure('navigation')
+        if locations:
+            self.selected_city = city_selector(locations[-1]).value
+            self.filters['locations'] = [city_selector(city).value for city in locations]
+        if dates:
+            self.data.extend(dates)
+            self.filters['dates'] = list(dates)
+        if guests:
+            self.data.append(guests)
+            self.filters['guests'] = guests
+        if self.verification.get('source') == 'snapshot':
+            await self.capture_snapshot()
+
+    async def get_property_cards(self) -> list[PropertyCard]:
+        """
+        Extract every property card of the results page in a single browser call.
+
+        Returns:
+            list[PropertyCard]: Location, dates, guest capacity and coming-soon flag of each card
+        """
+        raw_cards = await self.page.evaluate(EXTRACT_PROPERTY_CARDS_SCRIPT, CARD_SELECTORS)
+        logger.info(f"Extracted {len(raw_cards)} property cards.")
+        return [PropertyCard.from_dict(card) for card in raw_cards]
+
+    async def stream_property_cards(self) -> AsyncIterator[PropertyCard]:
+        """
+        Scroll through the results one viewport at a time and yield every property card
+        as soon as it is rendered, once the list stayed unchanged for `streaming.step_ms`
+        after each scroll. Ends once the bottom is reached and the page stays unchanged
+        for `streaming.settle_ms`.
+
+        Yields:
+            PropertyCard: The next card of the results, in page order
+
+        Raises:
+            TimeoutError: If the list keeps changing for `streaming.timeout_ms`
+        """
+        settle_ms = self.streaming.get('settle_ms', 500)
+        step_ms = self.streaming.get('step_ms', 100)
+        timeout = self.streaming.get('timeout_ms', 30000)
+        await self.page.evaluate(WATCH_PROPERTY_LIST_SCRIPT, HomePageResultSelectors.PROPERTIES_LIST.value)
+        seen = 0
+        while True:
+            raw_cards = await self.page.evaluate(EXTRACT_PROPERTY_CARDS_SCRIPT, {**CARD_SELECTORS, 'offset': seen})
+            seen += len(raw_cards)
+            for card in raw_cards:
+                yield PropertyCard.from_dict(card)
+            scroll = await self.page.evaluate(SCROLL_PROPERTY_LIST_SCRIPT)
+            if not scroll['bottom']:
+                await self.page.wait_for_function(
+                    VIEWPORT_RENDERED_SCRIPT, arg={'scrolled_at': scroll['scrolledAt'], 'step_ms': step_ms},
+                    polling='raf', timeout=timeout,
+                )
+                continue
+            handle = await self.page.wait_for_function(
+                PROPERTY_LIST_SETTLED_SCRIPT,
+                arg={'location': CARD_SELECTORS['location'], 'known': seen, 'settle_ms': settle_ms},
+                polling='raf', timeout=timeout,
+            )
+            if await handle.json_value() == 'settled':
+                logger.info(f"Streamed {seen} property cards.")
+                return
+
+    async def capture_snapshot(self) -> ResultsSnapshot:
+        """
+        Load the whole results list and keep its HTML, so that the verify steps check
+        it in Python without going back to the browser.
+
+        Returns:
+            ResultsSnapshot: The snapshot of the results page
+        """
+        async for _ in self.stream_property_cards():
+            pass
+        self.snapshot = ResultsSnapshot(
+            await self.page.content(), url=self.page.url, filters=dict(self.filters), scenario=recorder.scenario,
+        )
+        if self.verification.get('snapshot_archive'):
+            self.snapshot.save(self.verification['snapshot_archive'])
+        return self.snapshot
+
+    async def get_result_cards(self) -> list[PropertyCard]:
+        """
+        Get the property cards the verify steps check, from the snapshot, the search
+        API responses or the page, following `verification.source`.
+
+        Returns:
+            list[PropertyCard]: Every property of the search results
+        """
+        if self.snapshot:
+            return self.snapshot.cards
+        if not self.search_responses:
+            return await self.get_property_cards()
+        cards = self.search_responses.get_property_cards()
+        spot_check(await self.get_property_cards(), cards, self.verification.get('dom_spot_checks', 3))
+        return cards
+
+    async def reset_filters(self):
+        """
+        Clear the filters of the previous search and open the location filter again.
+        A page left in an unknown state by a failed search is reloaded first.
+        """
+        locations = self.filters.get('locations') or []
+        self.selected_city = None
+        self.filters = {}
+        self.data = []
+        self.snapshot = None
+        await self.page.keyboard.press('Escape')
+        wherever_button = HomePageButtonSelectors.BUTTON_WHEREVER.value
+        # The location button shows the selected locations, latest first
+        location_button = self.page.get_by_role(
+            wherever_button[0], name=", ".join(reversed(locations)) if locations else wherever_button[1], exact=True,
+        )
+        if not await location_button.count():
+            logger.info("Reloading the homepage to reset the filters.")
+            await self.page.goto(self.base_url, wait_until='domcontentloaded')
+            await self.readiness.wait_for(Readiness.SEARCH_BAR_READY)
+            location_button = self.page.get_by_role(wherever_button[0], name=wherever_button[1], exact=True)
+            locations = []
+        logger.info(f"Resetting the location filter: {', '.join(locations) or 'none selected'}.")
+        await location_button.click()
+        await self.readiness.wait_for(Readiness.LOCATION_POPOVER_OPEN)
+        for label in locations:
+            checkbox = self.page.get_by_label(label)
+            if await checkbox.is_checked():
+                await checkbox.uncheck()
+
+    @requires(Readiness.LOCATION_POPOVER_OPEN)
+    async def select_location(self, city: str):
+        """
+        Select a specific city from the location options.
+
+        Args:
+            city (str): The name of the city to select
+        """
+        logger.info(f"Selecting location: {city}.")
+        self.selected_city = city_selector(city).value
+        self.filters.setdefault('locations', []).append(self.selected_city)
+        await async_scroll_to_city(self.page, self.selected_city)
+        await self.page.get_by_label(self.selected_city).check()
+
+    async def verify_city_is_selected(self, city):
+        """
+        Verify that a specific city is selected in the filter.
+
+        Args:
+            city (str): The city name to verify
+        """
+        logger.info(f"Verifying that {city} is selected.")
+        await expect(self.page.get_by_role("button", name=city_selector(city).value)).to_be_visible()
+
+    @requires(Readiness.PROPERTIES_RENDERED)
+    async def verify_all_cities_are_correct(self):
+        """
+        Verify that all displayed properties are in the selected city.
+        """
+        logger.info(f"Verifying all properties are in {self.selected_city}.")
+        if self.snapshot or self.search_responses:
+            check_locations(await self.get_result_cards(), [self.selected_city])
+            return
+        async for card in self.stream_property_cards():
+            check_locations([card], [self.selected_city])
+
+    @requires(Readiness.PROPERTIES_RENDERED)
+    async def verify_number_of_properties(self):
+        """
+        Verify that the number of displayed properties matches the expected count
+        from the PropertiesData configuration.
+        """
+        logger.info("Verifying the number of displayed properties.")
+        await self.page.wait_for_selector(HomePageResultSelectors.PROPERTY_LOCATION.value, timeout=3000)
+        if self.snapshot or self.search_responses:
+            cards = await self.get_result_cards()
+        else:
+            # Lazily loaded lists are only complete once scrolled through
+            cards = [card async for card in self.stream_property_cards()]
+        check_property_count(cards, self.selected_city)
+
+    async def verify_cities_are_selected(self, city_one, city_two):
+        """
+        Verify that two cities are selected in the filter.
+
+        Args:
+            city_one (str): First city name to verify
+            city_two (str): Second city name to verify
+        """
+        logger.info(f"Verifying that {city_one} and {city_two} are selected.")
+        self.data.append(city_one)
+        self.data.append(city_two)
+        await expect(self.page.get_by_role("button", name=f"{city_two.lower()}, {city_one.lower()}")).to_be_visible()
+
+    @requires(Readiness.PROPERTIES_RENDERED)
+    async def verify_all_the_cities_are_correct(self):
+        """
+        Verify that all displayed properties are in either of the two selected cities.
+        """
+        logger.info("Verifying that all properties are in the selected cities.")
+        await self.page.wait_for_selector(HomePageResultSelectors.PROPERTY_LOCATION.value, timeout=3000)
+        if self.snapshot or self.search_responses:
+            check_locations(await self.get_result_cards(), self.data[:2])
+            return
+        # Check every card as it streams in, to stop on the first wrong one
+        async for card in self.stream_property_cards():
+            check_locations([card], self.data[:2])
+
+    @requires(Readiness.CALENDAR_READY)
+    async def select_dates(self, date_one, date_two):
+        """
+        Select check-in and check-out dates.
+
+        Args:
+            date_one (str): Check-in date to select
+            date_two (str): Check-out date to select
+        """
+        logger.info(f"Selecting dates: {date_one} to {date_two}.")
+        self.data.append(date_one)
+        self.data.append(date_two)
+        self.filters['dates'] = [date_one, date_two]
+        await self.page.get_by_role("button", name=date_one).first.click()
+        await self.page.get_by_role("button", name=date_two).first.click()
+
+    async def verify_filter_date_is_correct(self):
+        """
+        Verify that the selected dates in the filter match the expected format and values.
+        """
+        logger.info("Verifying the selected date range in the filter.")
+        expected_dates = expected_filter_dates(self.data[0], self.data[1])
+        await expect(self.page.get_by_role("button", name=expected_dates)).to_be_visible()
+
+    @requires(Readiness.PROPERTIES_RENDERED)
+    async def verify_correct_date_of_the_results(self):
+        """
+        Verify that all property availabilities fall within the selected date range.
+        """
+        logger.info("Verifying that all results match the selected date range.")
+        check_dates(await self.get_result_cards(), int(self.data[0]), int(self.data[1]))
+
+    @requires(Readiness.GUESTS_POPOVER_OPEN)
+    async def click_on_plus_button_in_whoever(self, quantity):
+        """
+        Click the plus button to increase guest count.
+
+        Args:
+            quantity (str): Number of times to click the plus button
+        """
+        logger.info("Clicking on plus button to increase guests")
+        self.data.append(quantity)
+        self.filters['guests'] = quantity
+        for i in range(int(quantity)):
+            await self.page.locator("button:has(svg use[href*='plus'])").click()
+
+    async def verify_amount_of_guests_selected(self, guests):
+        """
+        Verify that the guest count in the filter matches the expected value.
+
+        Args:
+            guests (str): Expected number of guests
+        """
+        logger.info("Verifying that amount of guests in the button")
+        await expect(self.page.locator(f'button span:has-text("{guests} people")')).to_be_visible()
+
+    @requires(Readiness.PROPERTIES_RENDERED)
+    async def verify_guests_number(self):
+        """
+        Verify that all properties can accommodate the selected number of guests.
+        """
+        logger.info("Verifying the amount of guests in the properties")
+        expected_guests = int(self.data[0])
+        await self.page.wait_for_selector(HomePageResultSelectors.PROPERTY_CARD.value)
+        check_guests(await self.get_result_cards(), expected_guests)
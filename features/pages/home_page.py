@@ -1,11 +1,111 @@
-from datetime import datetime
-from playwright.sync_api import Page, expect
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Iterator
+from urllib.parse import urlencode, urljoin
 
-from config.selectors.home_page_selectors import HomePageButtonSelectors, HomePageCitySelectors
-from config.properties_data import PropertiesData
-from utils.utils import scroll_to_city, scroll_to_bottom
+from config.browser_config import load_config
+from config.selectors.home_page_selectors import HomePageButtonSelectors, HomePageCitySelectors, HomePageResultSelectors
+from features.pages.network_results import SearchResponseCollector, spot_check
+from features.pages.property_card import (
+    CARD_SELECTORS, EXTRACT_PROPERTY_CARDS_SCRIPT, PROPERTY_LIST_SETTLED_SCRIPT, SCROLL_PROPERTY_LIST_SCRIPT,
+    VIEWPORT_RENDERED_SCRIPT, WATCH_PROPERTY_LIST_SCRIPT, PropertyCard,
+    check_dates, check_guests, check_locations, check_property_count,
+)
+from features.pages.results_snapshot import ResultsSnapshot
+from utils.readiness import Readiness, ReadinessEngine, requires
+from utils.timing import recorder, timed_methods
+from utils.utils import scroll_to_city
+from utils.web_vitals import WebVitals
 from config.logger_config import setup_logger
-logger = setup_logger()
+logger = setup_logger(__name__)
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Page
+
+
+def expect(actual):
+    """
+    Playwright's `expect`, imported on first use so that collecting the scenarios
+    does not pay for importing Playwright.
+    """
+    from playwright.sync_api import expect as playwright_expect
+    return playwright_expect(actual)
+
+
+def city_selector(city: str) -> HomePageCitySelectors:
+    """
+    Look up the location filter label of a city.
+
+    Args:
+        city (str): The city name as written in the scenarios, e.g. "New York"
+    """
+    label_name = f"LABEL_{city.replace(' ', '_').upper()}"
+    return HomePageCitySelectors[label_name]
+
+
+def expected_filter_dates(date_one, date_two) -> str:
+    """
+    Build the label the date filter button shows once a date range is selected.
+    Calculates expected month based on current date and selected dates.
+
+    Args:
+        date_one (str): Selected check-in day
+        date_two (str): Selected check-out day
+    """
+    now = datetime.now()
+    current_day = now.day
+    start_date = int(date_one)-1
+    end_date = int(date_two)-1
+    if start_date < current_day:
+        expected_month = (now.month % 12) + 1 
+    else:
+        expected_month = now.month
+    expected_month_name = (now.replace(month=expected_month)).strftime("%b")
+    return f"{expected_month_name} {str(start_date)} - {expected_month_name} {str(end_date)}"
+
+
+def filter_date(day) -> date:
+    """
+    Resolve a day of the date filter to the date the calendar selects.
+    Days already past this month fall in the next month.
+
+    Args:
+        day (str): Day of the month, e.g. "13"
+    """
+    today = date.today()
+    if int(day) >= today.day:
+        return today.replace(day=int(day))
+    next_month = today.replace(day=1, month=today.month % 12 + 1, year=today.year + (today.month == 12))
+    return next_month.replace(day=int(day))
+
+
+def search_url(base_url, settings, locations=None, dates=None, guests=None) -> str:
+    """
+    Build the URL of a search results page with the given filters already applied.
+
+    Args:
+        base_url (str): URL of the homepage
+        settings (dict): The `deep_link` section of config.yaml
+        locations (list[str]): City names as written in the scenarios
+        dates (tuple[str, str]): Check-in and check-out days of the month
+        guests (str): Number of guests
+
+    Returns:
+        str: The search URL
+    """
+    params = settings.get('params') or {}
+    query = {}
+    if locations:
+        labels = [city_selector(city).value for city in locations]
+        query[params.get('locations', 'locations')] = settings.get('location_separator', ',').join(labels)
+    if dates:
+        query[params.get('check_in', 'checkIn')] = filter_date(dates[0]).isoformat()
+        query[params.get('check_out', 'checkOut')] = filter_date(dates[1]).isoformat()
+    if guests:
+        query[params.get('guests', 'guests')] = str(guests)
+    return f"{urljoin(base_url, settings.get('path', '/search'))}?{urlencode(query)}"
+
+
+@timed_methods
 class HomePage:
     """
     A page object class that represents the Wander website homepage.
@@ -13,35 +113,73 @@ class HomePage:
     including search filters, location selection, and results verification.
     """
     
-    def __init__(self, page: Page):
+    def __init__(self, page: 'Page', base_url: str = None):
         """
         Initialize HomePage with a Playwright page object.
 
         Args:
             page (Page): The Playwright page instance to interact with
+            base_url (str): URL of the homepage, defaults to `base_url` from config.yaml
         """
+        config = load_config()['default']
         self.page = page
+        self.base_url = base_url or config['base_url']
+        self.readiness = ReadinessEngine(page)
+        self.web_vitals = WebVitals.from_config(page, config.get('web_vitals'))
+        self.deep_link = config.get('deep_link') or {}
+        self.streaming = config.get('streaming') or {}
+        self.verification = config.get('verification') or {}
+        self.search_responses = None
+        if self.verification.get('source', 'dom') == 'network':
+            self.search_responses = SearchResponseCollector(
+                page, (config.get('readiness') or {}).get('search_response_url'),
+                self.verification.get('records_path'), self.verification.get('fields') or {},
+            )
+        self.snapshot = None
+        self.filters = {}
         self.selected_city = None
         self.data = []
         logger.info("Initialized HomePage object.")
 
     def navigate(self):
-        """Navigate to the Wander website homepage."""
-        logger.info("Navigating to Wander homepage.")
-        self.page.goto("https://www.wander.com")
+        """
+        Navigate to the Wander website homepage.
+        A page handed out by the context pool is already on it and is not reloaded.
+        """
+        if self.page.url.rstrip('/') == self.base_url.rstrip('/'):
+            # The load was the pool's warm-up, not part of this scenario
+            logger.info("Already on the Wander homepage, its navigation is not measured.")
+            self.readiness.wait_for(Readiness.SEARCH_BAR_READY)
+            return
+        logger.info(f"Navigating to Wander homepage: {self.base_url}.")
+        self.page.goto(self.base_url, wait_until='domcontentloaded')
+        self.readiness.wait_for(Readiness.SEARCH_BAR_READY)
+        if self.web_vitals:
+            self.web_vitals.measure('navigation')
+
+    def close(self):
+        """
+        Stop listening to the page, which a pooled context hands to the next scenario.
+        """
+        self.readiness.close()
+        if self.search_responses:
+            self.search_responses.close()
         
+    @requires(Readiness.SEARCH_BAR_READY)
     def click_on_wherever_button(self):
         """Click the 'Wherever' button to open location selection."""
         wherever_button = HomePageButtonSelectors.BUTTON_WHEREVER.value
         self.page.get_by_role(wherever_button[0], name=wherever_button[1]).click()
         logger.info("Clicking 'Wherever' button.")
         
+    @requires(Readiness.SEARCH_BAR_READY)
     def click_on_whenever_button(self):
         """Click the 'Whenever' button to open date selection."""
         whenever_button = HomePageButtonSelectors.BUTTON_WHENEVER.value
         self.page.get_by_role(whenever_button[0], name=whenever_button[1]).click()
         logger.info("Clicking 'Whenever' button.")
     
+    @requires(Readiness.SEARCH_BAR_READY)
     def click_on_whoever_button(self):
         """Click the 'Whoever' button to open guest selection."""
         whoever_button = HomePageButtonSelectors.BUTTON_WHOEVER.value
@@ -55,11 +193,170 @@ class HomePage:
         """
         logger.info("Clicking search button.")
         search_button = HomePageButtonSelectors.BUTTON_SEARCH.value
-        self.page.locator(search_button[1]).click()
-        self.page.wait_for_load_state('networkidle')
+        if self.search_responses:
+            self.search_responses.reset()
+        search_started = self.web_vitals.mark() if self.web_vitals else None
+        with self.readiness.after(Readiness.SEARCH_RESULTS_RESPONDED):
+            self.page.locator(search_button[1]).click()
         logger.info("Waiting for properties to be displayed.")
-        self.page.wait_for_selector('#properties-list a.card-wrapper').is_visible()
+        self.readiness.wait_for(Readiness.PROPERTIES_RENDERED)
+        if self.web_vitals:
+            self.web_vitals.measure('search', since=search_started)
+        if self.verification.get('source') == 'snapshot':
+            self.capture_snapshot()
+
+    def apply_filters(self, locations=None, dates=None, guests=None):
+        """
+        Open the search results with the filters already applied through a search URL,
+        skipping the clicks of the filter popovers. Scenarios that check the filter
+        controls themselves keep using the click methods.
+
+        Args:
+            locations (list[str]): City names to filter on
+            dates (tuple[str, str]): Check-in and check-out days of the month
+            guests (str): Number of guests
+        """
+        url = search_url(self.base_url, self.deep_link, locations, dates, guests)
+        logger.info(f"Opening search results: {url}.")
+        if self.search_responses:
+            self.search_responses.reset()
+        with self.readiness.after(Readiness.SEARCH_RESULTS_RESPONDED):
+            self.page.goto(url, wait_until='domcontentloaded')
+        self.readiness.wait_for(Readiness.PROPERTIES_RENDERED)
+        if self.web_vitals:
+            self.web_vitals.measure('navigation')
+        # Keep the same state the click methods leave for the verify steps
+        if locations:
+            self.selected_city = city_selector(locations[-1]).value
+            self.filters['locations'] = [city_selector(city).value for city in locations]
+        if dates:
+            self.data.extend(dates)
+            self.filters['dates'] = list(dates)
+        if guests:
+            self.data.append(guests)
+            self.filters['guests'] = guests
+        if self.verification.get('source') == 'snapshot':
+            self.capture_snapshot()
+
+    def get_property_cards(self) -> list[PropertyCard]:
+        """
+        Extract every property card of the results page in a single browser call.
+
+        Returns:
+            list[PropertyCard]: Location, dates, guest capacity and coming-soon flag of each card
+        """
+        raw_cards = self.page.evaluate(EXTRACT_PROPERTY_CARDS_SCRIPT, CARD_SELECTORS)
+        logger.info(f"Extracted {len(raw_cards)} property cards.")
+        return [PropertyCard.from_dict(card) for card in raw_cards]
+
+    def stream_property_cards(self) -> Iterator[PropertyCard]:
+        """
+        Scroll through the results one viewport at a time and yield every property card
+        as soon as it is rendered. After each scroll the list has to stay unchanged for
+        `streaming.step_ms` before its cards are read. Ends once the bottom is reached
+        and the page stays unchanged for `streaming.settle_ms`. The caller can stop
+        early, e.g. on the first card failing a check, without loading the rest of the list.
+
+        Yields:
+            PropertyCard: The next card of the results, in page order
+
+        Raises:
+            TimeoutError: If the list keeps changing for `streaming.timeout_ms`
+        """
+        settle_ms = self.streaming.get('settle_ms', 500)
+        step_ms = self.streaming.get('step_ms', 100)
+        timeout = self.streaming.get('timeout_ms', 30000)
+        self.page.evaluate(WATCH_PROPERTY_LIST_SCRIPT, HomePageResultSelectors.PROPERTIES_LIST.value)
+        seen = 0
+        while True:
+            raw_cards = self.page.evaluate(EXTRACT_PROPERTY_CARDS_SCRIPT, {**CARD_SELECTORS, 'offset': seen})
+            seen += len(raw_cards)
+            for card in raw_cards:
+                yield PropertyCard.from_dict(card)
+            scroll = self.page.evaluate(SCROLL_PROPERTY_LIST_SCRIPT)
+            if not scroll['bottom']:
+                self.page.wait_for_function(
+                    VIEWPORT_RENDERED_SCRIPT, arg={'scrolled_at': scroll['scrolledAt'], 'step_ms': step_ms},
+                    polling='raf', timeout=timeout,
+                )
+                continue
+            outcome = self.page.wait_for_function(
+                PROPERTY_LIST_SETTLED_SCRIPT,
+                arg={'location': CARD_SELECTORS['location'], 'known': seen, 'settle_ms': settle_ms},
+                polling='raf', timeout=timeout,
+            ).json_value()
+            if outcome == 'settled':
+                logger.info(f"Streamed {seen} property cards.")
+                return
 
+    def capture_snapshot(self) -> ResultsSnapshot:
+        """
+        Load the whole results list and keep its HTML, so that the verify steps check
+        it in Python without going back to the browser. The snapshot is archived to
+        `verification.snapshot_archive` when set, to re-run the checks later.
+
+        Returns:
+            ResultsSnapshot: The snapshot of the results page
+        """
+        for _ in self.stream_property_cards():
+            pass
+        self.snapshot = ResultsSnapshot(
+            self.page.content(), url=self.page.url, filters=dict(self.filters), scenario=recorder.scenario,
+        )
+        if self.verification.get('snapshot_archive'):
+            self.snapshot.save(self.verification['snapshot_archive'])
+        return self.snapshot
+
+    def get_result_cards(self) -> list[PropertyCard]:
+        """
+        Get the property cards the verify steps check.
+        With `verification.source: network` they come from the search API responses and
+        only the first rendered cards are compared with them, with `snapshot` they are
+        parsed from the snapshot taken after the search, otherwise read from the page.
+
+        Returns:
+            list[PropertyCard]: Every property of the search results
+        """
+        if self.snapshot:
+            return self.snapshot.cards
+        if not self.search_responses:
+            return self.get_property_cards()
+        cards = self.search_responses.get_property_cards()
+        spot_check(self.get_property_cards(), cards, self.verification.get('dom_spot_checks', 3))
+        return cards
+
+    def reset_filters(self):
+        """
+        Clear the filters of the previous search and open the location filter again,
+        so that one loaded page serves the searches of many locations. A page left in
+        an unknown state by a failed search is reloaded first.
+        """
+        locations = self.filters.get('locations') or []
+        self.selected_city = None
+        self.filters = {}
+        self.data = []
+        self.snapshot = None
+        self.page.keyboard.press('Escape')
+        wherever_button = HomePageButtonSelectors.BUTTON_WHEREVER.value
+        # The location button shows the selected locations, latest first
+        location_button = self.page.get_by_role(
+            wherever_button[0], name=", ".join(reversed(locations)) if locations else wherever_button[1], exact=True,
+        )
+        if not location_button.count():
+            logger.info("Reloading the homepage to reset the filters.")
+            self.page.goto(self.base_url, wait_until='domcontentloaded')
+            self.readiness.wait_for(Readiness.SEARCH_BAR_READY)
+            location_button = self.page.get_by_role(wherever_button[0], name=wherever_button[1], exact=True)
+            locations = []
+        logger.info(f"Resetting the location filter: {', '.join(locations) or 'none selected'}.")
+        location_button.click()
+        self.readiness.wait_for(Readiness.LOCATION_POPOVER_OPEN)
+        for label in locations:
+            checkbox = self.page.get_by_label(label)
+            if checkbox.is_checked():
+                checkbox.uncheck()
+
+    @requires(Readiness.LOCATION_POPOVER_OPEN)
     def select_location(self, city: str):
         """
         Select a specific city from the location options.
@@ -68,12 +365,10 @@ class HomePage:
             city (str): The name of the city to select
         """
         logger.info(f"Selecting location: {city}.")
-        self.page.wait_for_load_state('networkidle')
-        label_name = f"LABEL_{city.replace(' ', '_').upper()}"
-        city_selector = HomePageCitySelectors[label_name]
-        self.selected_city = city_selector.value
+        self.selected_city = city_selector(city).value
+        self.filters.setdefault('locations', []).append(self.selected_city)
         scroll_to_city(self.page, self.selected_city)
-        self.page.get_by_label(city_selector.value).check()
+        self.page.get_by_label(self.selected_city).check()
         
     def verify_city_is_selected(self, city):
         """
@@ -83,37 +378,29 @@ class HomePage:
             city (str): The city name to verify
         """
         logger.info(f"Verifying that {city} is selected.")
-        self.page.wait_for_load_state('networkidle')
-        label_name = f"LABEL_{city.replace(' ', '_').upper()}"
-        city_selector = HomePageCitySelectors[label_name]
-        expect(self.page.get_by_role("button", name=city_selector.value)).to_be_visible()
+        expect(self.page.get_by_role("button", name=city_selector(city).value)).to_be_visible()
 
+    @requires(Readiness.PROPERTIES_RENDERED)
     def verify_all_cities_are_correct(self):
         """
         Verify that all displayed properties are in the selected city.
         Checks each property's location text against the selected city.
         """
         logger.info(f"Verifying all properties are in {self.selected_city}.")
-        self.page.wait_for_load_state('networkidle')
-        city_elements = self.page.locator('div.text-property-eyebrow')
-        count = city_elements.count()
-
-        for i in range(count):
-            city_name = city_elements.nth(i).inner_text().lower()
-            assert self.selected_city in city_name, f"Expected city '{self.selected_city}' in '{city_name}'"
+        cards = self.get_result_cards() if self.snapshot or self.search_responses else self.stream_property_cards()
+        check_locations(cards, [self.selected_city])
 
+    @requires(Readiness.PROPERTIES_RENDERED)
     def verify_number_of_properties(self):
         """
         Verify that the number of displayed properties matches the expected count
         from the PropertiesData configuration.
         """
         logger.info("Verifying the number of displayed properties.")
-        self.page.wait_for_load_state('networkidle')
-        properties_data = PropertiesData[self.selected_city.replace(' ', '_').upper()].value
-        self.page.wait_for_selector('div.text-property-eyebrow',timeout=3000).is_visible()
-        city_elements = self.page.locator('div.text-property-eyebrow')
-        count = city_elements.count()
-        assert(count == properties_data["PROPERTIES"] + properties_data["COMMINGSOON"])
+        self.page.wait_for_selector(HomePageResultSelectors.PROPERTY_LOCATION.value, timeout=3000).is_visible()
+        # Lazily loaded lists are only complete once scrolled through
+        cards = self.get_result_cards() if self.snapshot or self.search_responses else list(self.stream_property_cards())
+        check_property_count(cards, self.selected_city)
         
     def verify_cities_are_selected(self, city_one, city_two):
         """
@@ -124,28 +411,22 @@ class HomePage:
             city_two (str): Second city name to verify
         """
         logger.info(f"Verifying that {city_one} and {city_two} are selected.")
-        self.page.wait_for_load_state('networkidle')
         self.data.append(city_one)
         self.data.append(city_two)
         expect(self.page.get_by_role("button", name=f"{city_two.lower()}, {city_one.lower()}")).to_be_visible()
 
+    @requires(Readiness.PROPERTIES_RENDERED)
     def verify_all_the_cities_are_correct(self): 
         """
         Verify that all displayed properties are in either of the two selected cities.
         Checks each property's location against both selected cities.
         """
         logger.info("Verifying that all properties are in the selected cities.")
-        scroll_to_bottom(self.page)
-        self.page.wait_for_load_state('networkidle')  
-        self.page.wait_for_selector('div.text-property-eyebrow',timeout=3000).is_visible()
-        city_elements = self.page.locator('div.text-property-eyebrow')
-        count = city_elements.count() 
-        for i in range(count):
-            city_name = city_elements.nth(i).inner_text().lower() 
-            logger.debug(f"Property {i+1}: {city_name}")
-            assert self.data[0].lower() in city_name or self.data[1].lower() in city_name, \
-                f"City name '{city_name}' does not match expected values: {self.data[0]}, {self.data[1]}"
+        self.page.wait_for_selector(HomePageResultSelectors.PROPERTY_LOCATION.value, timeout=3000).is_visible()
+        cards = self.get_result_cards() if self.snapshot or self.search_responses else self.stream_property_cards()
+        check_locations(cards, self.data[:2])
         
+    @requires(Readiness.CALENDAR_READY)
     def select_dates(self, date_one, date_two):
         """
         Select check-in and check-out dates.
@@ -155,51 +436,30 @@ class HomePage:
             date_two (str): Check-out date to select
         """
         logger.info(f"Selecting dates: {date_one} to {date_two}.")
-        self.page.wait_for_load_state('networkidle')
         self.data.append(date_one)
         self.data.append(date_two)
+        self.filters['dates'] = [date_one, date_two]
         self.page.get_by_role("button", name=date_one).first.click()
         self.page.get_by_role("button", name=date_two).first.click()
         
     def verify_filter_date_is_correct(self):
         """
         Verify that the selected dates in the filter match the expected format and values.
-        Calculates expected month based on current date and selected dates.
         """
         logger.info("Verifying the selected date range in the filter.")
-        self.page.wait_for_load_state('networkidle')
-        now = datetime.now()
-        current_day = now.day
-        start_date = int(self.data[0])-1  
-        end_date = int(self.data[1])-1
-        if start_date < current_day:
-            expected_month = (now.month % 12) + 1 
-        else:
-            expected_month = now.month
-        expected_month_name = (now.replace(month=expected_month)).strftime("%b")
-        expected_dates = f"{expected_month_name} {str(start_date)} - {expected_month_name} {str(end_date)}"
+        expected_dates = expected_filter_dates(self.data[0], self.data[1])
         expect(self.page.get_by_role("button", name=expected_dates)).to_be_visible()
         
+    @requires(Readiness.PROPERTIES_RENDERED)
     def verify_correct_date_of_the_results(self):
         """
         Verify that all property availabilities fall within the selected date range.
         Checks both start and end dates for each property.
         """
         logger.info("Verifying that all results match the selected date range.")
-        self.page.wait_for_load_state('networkidle')
-        dates_elements = self.page.query_selector_all('span.whitespace-nowrap.text-6-white')
-        start_day = int(self.data[0])
-        end_day = int(self.data[1])
-        for date_element in dates_elements:
-            date_text = date_element.inner_text()
-            date_parts = date_text.split(' to ')
-            result_start_day = int(date_parts[0].split(' ')[1])
-            result_end_day = int(date_parts[1].split(' ')[1])
-            assert start_day <= result_start_day <= end_day, \
-                f"Start date {result_start_day} is outside range {start_day}-{end_day}"
-            assert start_day <= result_end_day <= end_day, \
-                f"End date {result_end_day} is outside range {start_day}-{end_day}"
+        check_dates(self.get_result_cards(), int(self.data[0]), int(self.data[1]))
             
+    @requires(Readiness.GUESTS_POPOVER_OPEN)
     def click_on_plus_button_in_whoever(self, quantity):
         """
         Click the plus button to increase guest count.
@@ -208,8 +468,8 @@ class HomePage:
             quantity (str): Number of times to click the plus button
         """
         logger.info("Clicking on plus button to increase guests")
-        self.page.wait_for_load_state('networkidle')
         self.data.append(quantity)
+        self.filters['guests'] = quantity
         for i in range(int(quantity)):
             self.page.locator("button:has(svg use[href*='plus'])").click()
     
@@ -221,9 +481,9 @@ class HomePage:
             guests (str): Expected number of guests
         """
         logger.info("Verifying that amount of guests in the button")
-        self.page.wait_for_load_state('networkidle')
         expect(self.page.locator(f'button span:has-text("{guests} people")')).to_be_visible()
    
+    @requires(Readiness.PROPERTIES_RENDERED)
     def verify_guests_number(self):
         """
         Verify that all properties can accommodate the selected number of guests.
@@ -231,12 +491,6 @@ class HomePage:
         """
         logger.info("Verifying the amount of guests in the properties")
         expected_guests = int(self.data[0])
-        self.page.wait_for_load_state('networkidle')
-        self.page.wait_for_selector('#properties-list a').is_visible()
-        properties = self.page.query_selector_all('#properties-list a')
-        for property in properties:
-            guests_locator = property.query_selector("div.flex.items-center.gap-1.text-sm.pl-1 span:nth-of-type(3)")
-            guests_text = guests_locator.inner_text() if guests_locator else str(expected_guests + 1)
-            guests = int(guests_text.strip())
-            assert guests >= expected_guests, f"Expected at least {expected_guests} guests, but found {guests}."
+        self.page.wait_for_selector(HomePageResultSelectors.PROPERTY_CARD.value).is_visible()
+        check_guests(self.get_result_cards(), expected_guests)
             
\ No newline at end of file
@@ -0,0 +1,177 @@
+import re
+from datetime import datetime
+
+from config.logger_config import setup_logger
+from features.pages.property_card import PropertyCard
+
+logger = setup_logger(__name__)
+
+
+def resolve_path(data, path):
+    """
+    Follow a dotted path (e.g. "data.properties") into decoded JSON.
+
+    Args:
+        data: Decoded JSON value
+        path (str): Dot separated keys, list indexes are numbers; empty for the value itself
+
+    Returns:
+        The value found, or None when a key is missing
+    """
+    for key in filter(None, (path or '').split('.')):
+        if isinstance(data, list) and key.isdigit() and int(key) < len(data):
+            data = data[int(key)]
+        elif isinstance(data, dict):
+            data = data.get(key)
+        else:
+            return None
+    return data
+
+
+def _day_label(value):
+    """Format an ISO date the way the cards show it, e.g. "Oct 13"."""
+    day = datetime.fromisoformat(str(value)[:10])
+    return f"{day:%b} {day.day}"
+
+
+def card_from_record(record, fields):
+    """
+    Build a property card from one record of the search API.
+
+    Args:
+        record (dict): A property record of the response
+        fields (dict): Dotted paths of `location`, `start_date`, `end_date`, `guests`
+            and `coming_soon` inside the record
+
+    Returns:
+        PropertyCard: The card the record is rendered as
+    """
+    location = resolve_path(record, fields.get('location'))
+    start_date = resolve_path(record, fields.get('start_date'))
+    end_date = resolve_path(record, fields.get('end_date'))
+    guests = resolve_path(record, fields.get('guests'))
+    return PropertyCard.from_dict({
+        'location': ", ".join(location) if isinstance(location, list) else str(location or ''),
+        'dates': f"{_day_label(start_date)} to {_day_label(end_date)}" if start_date and end_date else None,
+        'guests': str(guests) if guests is not None else None,
+        'coming_soon': bool(resolve_path(record, fields.get('coming_soon'))),
+    })
+
+
+class SearchResponseCollector:
+    """
+    Captures the search API responses of a page and turns them into property cards.
+
+    Responses are kept from the last `reset()` on, so the cards always come from the
+    latest search, including any further pages the results list fetched. Their bodies
+    are read as soon as they arrive, since a later navigation may discard them.
+
+    The response schema (`records_path` and `fields`) has not been confirmed against
+    the site yet, so a response that does not match it fails the check instead of
+    yielding no cards.
+    """
+
+    def __init__(self, page, url_pattern, records_path, fields):
+        """
+        Start listening to the responses of a page.
+
+        Args:
+            page (Page): The Playwright page to listen to
+            url_pattern (str): Regular expression of the search API URL
+            records_path (str): Dotted path of the list of property records in the JSON body
+            fields (dict): Dotted paths of the card fields inside a record
+
+        Raises:
+            ValueError: If the search API URL is not configured
+        """
+        if not url_pattern:
+            raise ValueError("verification.source 'network' needs readiness.search_response_url in config.yaml")
+        self.page = page
+        self.url_pattern = re.compile(url_pattern)
+        self.records_path = records_path
+        self.fields = fields
+        self.responses = []
+        page.on('response', self._on_response)
+
+    def close(self):
+        """Stop listening to the responses of the page."""
+        self.page.remove_listener('response', self._on_response)
+
+    def _matches(self, response):
+        return self.url_pattern.search(response.url) and response.ok
+
+    def _on_response(self, response):
+        if not self._matches(response):
+            return
+        try:
+            body = response.json()
+        except Exception as error:
+            body = error
+            logger.error(f"Could not read the search response {response.url}: {error}")
+        self.responses.append((response.url, body))
+
+    def reset(self):
+        """Forget the responses captured so far, before a new search."""
+        self.responses = []
+
+    def get_property_cards(self):
+        """
+        Parse the captured responses into property cards.
+
+        Returns:
+            list[PropertyCard]: One card per property record, in response order
+
+        Raises:
+            AssertionError: If no search response was captured, a body could not be read
+                or `records_path` does not lead to a list of records
+        """
+        assert self.responses, f"No search response matching '{self.url_pattern.pattern}' was captured"
+        cards = []
+        for url, body in self.responses:
+            assert not isinstance(body, Exception), f"The search response {url} could not be read: {body}"
+            records = resolve_path(body, self.records_path)
+            assert isinstance(records, list), \
+                f"'{self.records_path}' does not lead to a list of records in the search response {url}"
+            cards.extend(card_from_record(record, self.fields) for record in records)
+        logger.info(f"Parsed {len(cards)} properties from {len(self.responses)} search responses.")
+        return cards
+
+
+class AsyncSearchResponseCollector(SearchResponseCollector):
+    """
+    The search response collector for pages of the asyncio Playwright API, whose
+    listener reads every body as a task of the event loop.
+    """
+
+    async def _on_response(self, response):
+        if not self._matches(response):
+            return
+        try:
+            body = await response.json()
+        except Exception as error:
+            body = error
+            logger.error(f"Could not read the search response {response.url}: {error}")
+        self.responses.append((response.url, body))
+
+
+def spot_check(dom_cards, network_cards, count):
+    """
+    Check that the first rendered cards agree with the search API responses.
+
+    Args:
+        dom_cards (list[PropertyCard]): Cards scraped from the results page
+        network_cards (list[PropertyCard]): Cards parsed from the search responses
+        count (int): Number of rendered cards to compare
+
+    Raises:
+        AssertionError: If a rendered card is missing from the responses
+    """
+    assert len(dom_cards) <= len(network_cards), \
+        f"{len(dom_cards)} properties are displayed but the search responses only hold {len(network_cards)}"
+    network_locations = {card.location for card in network_cards}
+    for card in dom_cards[:count]:
+        # Rendered locations may be truncated with an ellipsis
+        location = card.location.rstrip('.…')
+        assert any(network_location.startswith(location) for network_location in network_locations), \
+            f"Displayed property in '{card.location}' is not part of the search responses"
+    logger.info(f"Spot-checked {min(count, len(dom_cards))} displayed properties against the search responses.")
@@ -0,0 +1,195 @@
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from config.logger_config import setup_logger
+from config.properties_data import PropertiesData
+from config.selectors.home_page_selectors import HomePageResultSelectors
+
+logger = setup_logger(__name__)
+
+# Guest capacity at the start of the guests text, e.g. "8 guests" or "12+"
+LEADING_NUMBER = re.compile(r'\s*(\d+)')
+
+# Collects every property card of the results page in a single round trip,
+# skipping the first `selectors.offset` cards already collected.
+# Each card is anchored on its location eyebrow so that "coming soon" cards,
+# which have no availability or guest details, are still counted.
+EXTRACT_PROPERTY_CARDS_SCRIPT = '''(selectors) => {
+    return [...document.querySelectorAll(selectors.location)].slice(selectors.offset || 0).map(eyebrow => {
+        const card = eyebrow.closest('a') || eyebrow.parentElement;
+        const dates = card.querySelector(selectors.dates);
+        const guests = card.querySelector(selectors.guests);
+        return {
+            location: eyebrow.innerText,
+            dates: dates ? dates.innerText : null,
+            guests: guests ? guests.innerText : null,
+            coming_soon: /coming\\s*soon/i.test(card.innerText),
+        };
+    });
+}'''
+
+# Records when the results list last changed so that a lazily loaded list can
+# be told apart from one that is still growing. Installed once per results list, and
+# again when a search replaced the list; every stream restarts the clock, so that a
+# page reused for another search does not look settled from the previous one.
+WATCH_PROPERTY_LIST_SCRIPT = '''(list) => {
+    const node = document.querySelector(list) || document.body;
+    const previous = window.__propertyListWatch;
+    if (previous && previous.node === node) {
+        previous.changedAt = performance.now();
+        return;
+    }
+    if (previous) previous.observer.disconnect();
+    const watch = window.__propertyListWatch = { node, changedAt: performance.now() };
+    watch.observer = new MutationObserver(() => { watch.changedAt = performance.now(); });
+    watch.observer.observe(node, { childList: true, subtree: true });
+}'''
+
+# Scrolls the results down by one viewport, telling whether the bottom is reached
+# and when (page clock) the scroll happened.
+SCROLL_PROPERTY_LIST_SCRIPT = '''() => {
+    window.scrollBy({ top: window.innerHeight, behavior: 'instant' });
+    return {
+        bottom: window.innerHeight + window.scrollY >= document.body.scrollHeight - 1,
+        scrolledAt: performance.now(),
+    };
+}'''
+
+# After scrolling one viewport: true once the results list has not changed for
+# `step_ms` since the scroll, so the cards the scroll brought in are fully rendered.
+VIEWPORT_RENDERED_SCRIPT = '''(args) => {
+    return performance.now() - Math.max(window.__propertyListWatch.changedAt, args.scrolled_at) > args.step_ms;
+}'''
+
+# At the bottom of the results: truthy once more cards appeared ("grown") or
+# nothing changed on the page for `settle_ms` ("settled").
+PROPERTY_LIST_SETTLED_SCRIPT = '''(args) => {
+    if (document.querySelectorAll(args.location).length > args.known) return 'grown';
+    return performance.now() - window.__propertyListWatch.changedAt > args.settle_ms ? 'settled' : false;
+}'''
+
+CARD_SELECTORS = {
+    'location': HomePageResultSelectors.PROPERTY_LOCATION.value,
+    'dates': HomePageResultSelectors.PROPERTY_DATES.value,
+    'guests': HomePageResultSelectors.PROPERTY_GUESTS.value,
+}
+
+
+@dataclass(frozen=True)
+class PropertyCard:
+    """
+    A property listed on the results page.
+
+    Attributes:
+        location (str): Lowercased location eyebrow, e.g. "catskills, new york"
+        dates (str): Availability text such as "Oct 13 to Oct 16", None when not shown
+        guests (int): Maximum guest capacity, None when not shown
+        coming_soon (bool): Whether the property is flagged as coming soon
+    """
+    location: str
+    dates: Optional[str]
+    guests: Optional[int]
+    coming_soon: bool
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PropertyCard":
+        """
+        Build a card from the raw values extracted in the browser.
+
+        Args:
+            data (dict): Raw `location`, `dates`, `guests` and `coming_soon` values
+
+        Raises:
+            ValueError: If a guests text is shown but does not start with a number
+        """
+        guests = (data.get('guests') or '').strip()
+        match = LEADING_NUMBER.match(guests)
+        if guests and not match:
+            raise ValueError(f"Guest capacity '{guests}' of the property in '{data['location'].strip()}' is not a number")
+        return cls(
+            location=data['location'].strip().lower(),
+            dates=data.get('dates'),
+            guests=int(match.group(1)) if match else None,
+            coming_soon=bool(data.get('coming_soon')),
+        )
+
+    @property
+    def start_day(self) -> Optional[int]:
+        """Day of the month the availability starts, None without dates."""
+        return self._day(0)
+
+    @property
+    def end_day(self) -> Optional[int]:
+        """Day of the month the availability ends, None without dates."""
+        return self._day(1)
+
+    def _day(self, index: int) -> Optional[int]:
+        if not self.dates:
+            return None
+        date_parts = self.dates.split(' to ')
+        return int(date_parts[index].split(' ')[1])
+
+
+def check_locations(cards, locations):
+    """
+    Assert that every card is in one of the given locations.
+
+    Args:
+        cards (Iterable[PropertyCard]): The cards to check
+        locations (Iterable[str]): Accepted location names, case insensitive
+    """
+    locations = [location.lower() for location in locations]
+    for i, card in enumerate(cards):
+        logger.debug(f"Property {i+1}: {card.location}")
+        assert any(location in card.location for location in locations), \
+            f"City name '{card.location}' does not match expected values: {', '.join(locations)}"
+
+
+def check_property_count(cards, city):
+    """
+    Assert that the number of cards matches the expected count from PropertiesData.
+
+    Args:
+        cards (list[PropertyCard]): The cards to check
+        city (str): The selected location, e.g. "new york"
+    """
+    properties_data = PropertiesData[re.sub(r'\W+', '_', city).upper()].value
+    coming_soon = sum(card.coming_soon for card in cards)
+    logger.info(f"Found {len(cards)} properties, {coming_soon} of them coming soon.")
+    assert(len(cards) == properties_data["PROPERTIES"] + properties_data["COMMINGSOON"])
+
+
+def check_dates(cards, start_day, end_day):
+    """
+    Assert that the availability of every card falls within the selected days.
+    Cards without availability are skipped.
+
+    Args:
+        cards (Iterable[PropertyCard]): The cards to check
+        start_day (int): First selected day of the month
+        end_day (int): Last selected day of the month
+    """
+    for card in cards:
+        if card.dates is None:
+            continue
+        assert start_day <= card.start_day <= end_day, \
+            f"Start date {card.start_day} is outside range {start_day}-{end_day}"
+        assert start_day <= card.end_day <= end_day, \
+            f"End date {card.end_day} is outside range {start_day}-{end_day}"
+
+
+def check_guests(cards, expected_guests):
+    """
+    Assert that every card accommodates at least the selected number of guests.
+    Cards without a guest capacity are skipped.
+
+    Args:
+        cards (Iterable[PropertyCard]): The cards to check
+        expected_guests (int): The selected number of guests
+    """
+    for card in cards:
+        if card.guests is None:
+            continue
+        assert card.guests >= expected_guests, \
+            f"Expected at least {expected_guests} guests, but found {card.guests}."
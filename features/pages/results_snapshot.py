@@ -0,0 +1,257 @@
+import gzip
+import json
+import os
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Optional
+
+from config.logger_config import setup_logger
+from features.pages.property_card import (
+    CARD_SELECTORS, PropertyCard, check_dates, check_guests, check_locations, check_property_count,
+)
+
+logger = setup_logger(__name__)
+
+# Elements that never have children or an end tag
+VOID_ELEMENTS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr',
+))
+
+# One compound selector of the subset understood by `select`: tag, #id, .classes, :nth-of-type(n)
+COMPOUND_SELECTOR = re.compile(r'^(?P<tag>[\w-]+)?(?P<id>#[\w-]+)?(?P<classes>(?:\.[\w\\/:-]+)*)(?::nth-of-type\((?P<nth>\d+)\))?$')
+
+COMING_SOON = re.compile(r'coming\s*soon', re.IGNORECASE)
+
+
+@dataclass
+class Element:
+    """An element of a parsed snapshot."""
+    tag: str
+    attributes: dict
+    parent: Optional["Element"] = None
+    children: list = field(default_factory=list)
+
+    @property
+    def classes(self):
+        return set((self.attributes.get('class') or '').split())
+
+    def text(self):
+        """Text content with whitespace collapsed, close to what `innerText` shows."""
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            elif node.tag not in ('script', 'style'):
+                stack.extend(reversed(node.children))
+        return ' '.join(''.join(parts).split())
+
+    def iter(self):
+        """Every descendant element, in document order."""
+        for child in self.children:
+            if isinstance(child, Element):
+                yield child
+                yield from child.iter()
+
+    def closest(self, tag):
+        """The nearest ancestor (or the element itself) with this tag, or None."""
+        element = self
+        while element is not None and element.tag != tag:
+            element = element.parent
+        return element
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element('#document', {})
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        element = Element(tag, {name: value or '' for name, value in attrs}, parent=self.current)
+        self.current.children.append(element)
+        if tag not in VOID_ELEMENTS:
+            self.current = element
+
+    def handle_startendtag(self, tag, attrs):
+        self.current.children.append(Element(tag, {name: value or '' for name, value in attrs}, parent=self.current))
+
+    def handle_endtag(self, tag):
+        element = self.current.closest(tag)
+        if element is not None and element is not self.root:
+            self.current = element.parent
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+
+def parse_html(html):
+    """
+    Parse an HTML document into a tree of `Element`.
+
+    Args:
+        html (str): The document
+
+    Returns:
+        Element: The document root
+    """
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def _matches(element, compound):
+    match = COMPOUND_SELECTOR.match(compound)
+    if match is None:
+        raise ValueError(f"Unsupported selector: {compound}")
+    if match['tag'] and element.tag != match['tag']:
+        return False
+    if match['id'] and element.attributes.get('id') != match['id'][1:]:
+        return False
+    classes = {name.replace('\\', '') for name in match['classes'].split('.') if name}
+    if not classes <= element.classes:
+        return False
+    if match['nth']:
+        siblings = [child for child in element.parent.children
+                    if isinstance(child, Element) and child.tag == element.tag]
+        return siblings.index(element) + 1 == int(match['nth'])
+    return True
+
+
+def select(root, selector):
+    """
+    Find the elements matching a CSS selector made of descendant compound selectors
+    (tag, #id, .class and :nth-of-type(n)), the subset used by the result selectors.
+
+    Args:
+        root (Element): Where to search
+        selector (str): The CSS selector
+
+    Returns:
+        list[Element]: The matching elements, in document order
+    """
+    *ancestors, last = selector.split()
+    found = []
+    for element in root.iter():
+        if not _matches(element, last):
+            continue
+        pending = list(ancestors)
+        ancestor = element.parent
+        while pending and ancestor is not None:
+            if ancestor.tag != '#document' and _matches(ancestor, pending[-1]):
+                pending.pop()
+            ancestor = ancestor.parent
+        if not pending:
+            found.append(element)
+    return found
+
+
+def parse_property_cards(html):
+    """
+    Extract the property cards of a results page snapshot, like `EXTRACT_PROPERTY_CARDS_SCRIPT`
+    does in the browser: each card is anchored on its location eyebrow.
+
+    Args:
+        html (str): The results page
+
+    Returns:
+        list[PropertyCard]: The cards, in page order
+    """
+    cards = []
+    for eyebrow in select(parse_html(html), CARD_SELECTORS['location']):
+        card = eyebrow.closest('a') or eyebrow.parent
+        dates = select(card, CARD_SELECTORS['dates'])
+        guests = select(card, CARD_SELECTORS['guests'])
+        cards.append(PropertyCard.from_dict({
+            'location': eyebrow.text(),
+            'dates': dates[0].text() if dates else None,
+            'guests': guests[0].text() if guests else None,
+            'coming_soon': bool(COMING_SOON.search(card.text())),
+        }))
+    return cards
+
+
+@dataclass
+class ResultsSnapshot:
+    """
+    The HTML of a results page captured once, with the filters of the search.
+
+    Attributes:
+        html (str): The page content
+        url (str): URL of the page
+        filters (dict): `locations`, `dates` and `guests` of the search, when set
+        scenario (str): The scenario that captured it
+        captured_at (str): Capture time
+    """
+    html: str
+    url: str = ''
+    filters: dict = field(default_factory=dict)
+    scenario: Optional[str] = None
+    captured_at: str = field(default_factory=lambda: time.strftime('%Y-%m-%dT%H:%M:%S'))
+
+    @property
+    def cards(self):
+        """The property cards of the page, parsed on first use."""
+        if not hasattr(self, '_cards'):
+            self._cards = parse_property_cards(self.html)
+        return self._cards
+
+    def save(self, directory):
+        """
+        Archive the snapshot as gzipped JSON.
+
+        Args:
+            directory (str): The snapshot archive
+
+        Returns:
+            str: Path of the archived snapshot
+        """
+        os.makedirs(directory, exist_ok=True)
+        name = re.sub(r'[^\w.-]+', '_', f"{self.captured_at}_{self.scenario or 'snapshot'}")
+        path = os.path.join(directory, f"{name}_{uuid.uuid4().hex[:8]}.json.gz")
+        with gzip.open(path, 'wt', encoding='utf-8') as file:
+            json.dump({
+                'url': self.url, 'filters': self.filters, 'scenario': self.scenario,
+                'captured_at': self.captured_at, 'html': self.html,
+            }, file)
+        logger.info(f"Results snapshot archived to {path}.")
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read an archived snapshot.
+
+        Args:
+            path (str): Path of the archived snapshot
+
+        Returns:
+            ResultsSnapshot: The snapshot
+        """
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            return cls(**json.load(file))
+
+    def validate(self):
+        """
+        Run the checks the filters of the search call for.
+        The property count is only checked for a search on a single location.
+
+        Raises:
+            AssertionError: If a check fails
+        """
+        locations = self.filters.get('locations') or []
+        dates = self.filters.get('dates')
+        guests = self.filters.get('guests')
+        if locations:
+            check_locations(self.cards, locations)
+        if dates:
+            check_dates(self.cards, int(dates[0]), int(dates[1]))
+        if guests:
+            check_guests(self.cards, int(guests))
+        if len(locations) == 1 and not dates and not guests:
+            check_property_count(self.cards, locations[0])
@@ -0,0 +1,9 @@
+Feature: Location Matrix
+
+  @TC-07 @filter_location @location_matrix
+  Scenario: TC-07 Verify the results of every location searched from one results page
+    Given the location filter of the shared page is reset
+    When the user selects the location of the case from the location filter
+    And the user performs the search
+    Then only results from the selected city are displayed
+    And the user sees all the properties in the city
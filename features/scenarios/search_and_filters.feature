@@ -40,3 +40,9 @@ Feature: Search Filters Functionality
     Then the selected location should be "New York"
     And the selected amount of people is "6"
     And the user only sees properties with the number of people greater than or equal to the selected number of people.
+
+  @TC-06 @filter_location @deep_link
+  Scenario: TC-06 Verify the results of a location search opened from a search link
+    Given the user opens the search results for "New York"
+    Then only results from the selected city are displayed
+    And the user sees all the properties in the city
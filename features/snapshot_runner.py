@@ -0,0 +1,85 @@
+"""
+Re-runs the result checks over archived results page snapshots, without a browser.
+
+Snapshots are archived by `HomePage` with `verification.source: snapshot`. Each one
+holds the page HTML and the filters of its search, so the location, date, guest and
+count checks can be run again whenever the validation logic changes. Snapshots are
+validated in parallel processes. Usage:
+
+    python -m features.snapshot_runner                        # The archive of config.yaml
+    python -m features.snapshot_runner reports/snapshots/2026-10-18T10_12_07_*.json.gz --workers 8
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from config.browser_config import load_config
+from features.pages.results_snapshot import ResultsSnapshot
+
+
+def validate_file(path):
+    """
+    Validate one archived snapshot.
+
+    Args:
+        path (str): Path of the archived snapshot
+
+    Returns:
+        tuple[str, int, str]: The path, the number of cards and the failure message (None when it passed)
+    """
+    snapshot = ResultsSnapshot.load(path)
+    try:
+        snapshot.validate()
+    except AssertionError as error:
+        return path, len(snapshot.cards), str(error) or "check failed"
+    return path, len(snapshot.cards), None
+
+
+def find_snapshots(paths):
+    """
+    Expand directories and glob patterns into snapshot files.
+
+    Args:
+        paths (list[str]): Snapshot files, directories or glob patterns
+
+    Returns:
+        list[str]: The snapshot files, sorted
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(glob.glob(os.path.join(path, '**', '*.json.gz'), recursive=True))
+        else:
+            files.extend(glob.glob(path))
+    return sorted(set(files))
+
+
+def main(argv=None):
+    archive = (load_config()['default'].get('verification') or {}).get('snapshot_archive') or 'reports/snapshots'
+    parser = argparse.ArgumentParser(description="Re-run the result checks over archived snapshots.")
+    parser.add_argument('paths', nargs='*', default=[archive],
+                        help=f"Snapshot files, directories or glob patterns (default: {archive})")
+    parser.add_argument('--workers', type=int, default=None, help="Parallel processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    files = find_snapshots(args.paths)
+    if not files:
+        print("No snapshots found.")
+        return 1
+    started = time.perf_counter()
+    with ProcessPoolExecutor(args.workers) as executor:
+        results = list(executor.map(validate_file, files, chunksize=16))
+    failures = [(path, message) for path, _, message in results if message]
+    for path, message in failures:
+        print(f"FAILED  {path}: {message}")
+    cards = sum(count for _, count, _ in results)
+    print(f"{len(files) - len(failures)} passed, {len(failures)} failed, {cards} cards checked "
+          f"in {time.perf_counter() - started:.2f}s")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
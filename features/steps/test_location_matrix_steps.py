@@ -0,0 +1,54 @@
+import os
+
+import pytest
+from pytest_bdd import given, scenario, then, when
+from config.properties_data import PropertiesData
+from features.pages.home_page import HomePage
+from utils.readiness import Readiness, retry_step
+
+# Every location of the catalog, written the way the scenarios name them, e.g. "New York".
+# Read from `__members__` since locations with the same counts are aliases of one member.
+LOCATIONS = [name.replace('_', ' ').title() for name in PropertiesData.__members__]
+
+
+@pytest.fixture(scope="module")
+def home_page(module_page):
+    """
+    Loads the homepage once for all the cases of the matrix.
+    """
+    home_page = HomePage(module_page)
+    home_page.navigate()
+    yield home_page
+    home_page.close()
+
+
+@pytest.mark.parametrize('location', LOCATIONS)
+@scenario(
+    os.path.join(os.path.dirname(__file__), '../scenarios/location_matrix.feature'),
+    'TC-07 Verify the results of every location searched from one results page',
+)
+def test_location_matrix(location):
+    pass
+
+@given('the location filter of the shared page is reset')
+def step_given(request, home_page, location):
+    request.node.user_properties.append(('location', location))
+    home_page.reset_filters()
+
+@when('the user selects the location of the case from the location filter')
+def step_when(home_page, location):
+    home_page.select_location(location)
+
+@when('the user performs the search')
+def step_when(home_page):
+    home_page.click_on_search_button()
+
+@then('only results from the selected city are displayed')
+@retry_step(Readiness.PROPERTIES_RENDERED)
+def step_then(home_page):
+    home_page.verify_all_cities_are_correct()
+
+@then('the user sees all the properties in the city')
+@retry_step(Readiness.PROPERTIES_RENDERED)
+def step_then(home_page):
+    home_page.verify_number_of_properties()
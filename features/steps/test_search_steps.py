@@ -3,17 +3,25 @@ import os
 import pytest
 from pytest_bdd import given, scenarios, then, when, parsers
 from features.pages.home_page import HomePage
+from utils.readiness import Readiness, retry_step
 
 scenarios(os.path.join(os.path.dirname(__file__), '../scenarios/search_and_filters.feature'))
 
 @pytest.fixture(scope="function")
 def home_page(page):
-    return HomePage(page)
+    home_page = HomePage(page)
+    yield home_page
+    home_page.close()
 
 @given('the user is on the home page')
 def step_given(home_page):
     home_page.navigate()
     
+
+
+@given(parsers.parse('the user opens the search results for "{city}"'))
+def step_given(home_page, city):
+    home_page.apply_filters(locations=[city])
     
 @given('the user selects wherever button')
 def step_given(home_page):
@@ -29,14 +37,17 @@ def step_when(home_page):
     home_page.click_on_search_button()
     
 @then(parsers.parse('the selected location should be "{location}"'))
+@retry_step()
 def step_then(home_page, location):
     home_page.verify_city_is_selected(location)
     
 @then('only results from the selected city are displayed')
+@retry_step(Readiness.PROPERTIES_RENDERED)
 def step_then(home_page):
     home_page.verify_all_cities_are_correct()
 
 @then('the user sees all the properties in the city')
+@retry_step(Readiness.PROPERTIES_RENDERED)
 def step_then(home_page):
   home_page.verify_number_of_properties()
 
@@ -45,6 +56,7 @@ def step_then(home_page, city_one, city_two):
     home_page.verify_cities_are_selected(city_one, city_two)
 
 @then('only results from the selected locations are displayed')
+@retry_step(Readiness.PROPERTIES_RENDERED)
 def step_then(home_page):
     home_page.verify_all_the_cities_are_correct()
     
@@ -57,10 +69,12 @@ def step_when(home_page, date_one, date_two):
     home_page.select_dates(date_one, date_two)
 
 @then('the correct dates should be displayed in the filters')
+@retry_step()
 def step_then(home_page):
     home_page.verify_filter_date_is_correct()
     
 @then('the results should be displayed for the selected dates')
+@retry_step(Readiness.PROPERTIES_RENDERED)
 def step_then(home_page):
     home_page.verify_correct_date_of_the_results()
 
@@ -73,10 +87,12 @@ def step_when(home_page, guests):
     home_page.click_on_plus_button_in_whoever(guests)
 
 @then(parsers.parse('the selected amount of people is "{guests}"'))
+@retry_step()
 def step_then(home_page, guests):
    home_page.verify_amount_of_guests_selected(guests)
 
 @then('the user only sees properties with the number of people greater than or equal to the selected number of people.')
+@retry_step(Readiness.PROPERTIES_RENDERED)
 def step_then(home_page):
     home_page.verify_guests_number()
     
\ No newline at end of file
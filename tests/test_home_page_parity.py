@@ -0,0 +1,27 @@
+import inspect
+
+from features.pages.async_home_page import AsyncHomePage
+from features.pages.home_page import HomePage
+
+
+def public_methods(cls):
+    return {name: method for name, method in vars(cls).items() if callable(method) and not name.startswith('_')}
+
+
+def test_async_home_page_has_every_home_page_method():
+    assert sorted(public_methods(AsyncHomePage)) == sorted(public_methods(HomePage))
+
+
+def test_async_home_page_methods_are_asynchronous():
+    for name, method in public_methods(HomePage).items():
+        async_method = public_methods(AsyncHomePage)[name]
+        if inspect.isgeneratorfunction(method):
+            assert inspect.isasyncgenfunction(async_method), name
+        else:
+            assert inspect.iscoroutinefunction(async_method), name
+
+
+def test_async_home_page_methods_take_the_same_arguments():
+    for name, method in public_methods(HomePage).items():
+        expected = list(inspect.signature(method).parameters)
+        assert list(inspect.signature(public_methods(AsyncHomePage)[name]).parameters) == expected, name
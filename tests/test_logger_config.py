@@ -0,0 +1,27 @@
+import json
+import logging
+import queue
+
+from config.logger_config import ContextFilter, ContextQueueHandler, JsonFormatter
+
+
+def test_exception_is_logged_in_its_own_field(monkeypatch):
+    log_queue = queue.SimpleQueue()
+    handler = ContextQueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+    logger = logging.getLogger('tests.logger_config')
+    monkeypatch.setattr(logger, 'propagate', False)
+    logger.addHandler(handler)
+    try:
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.exception("boom")
+    finally:
+        logger.removeHandler(handler)
+
+    entry = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+    assert entry['message'] == "boom"
+    assert entry['level'] == "ERROR"
+    assert "ZeroDivisionError: division by zero" in entry['exception']
+    assert "Traceback" not in entry['message']
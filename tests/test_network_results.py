@@ -0,0 +1,48 @@
+import pytest
+
+from features.pages.network_results import SearchResponseCollector, card_from_record, resolve_path
+
+FIELDS = {
+    'location': 'address.city', 'start_date': 'availability.0.start', 'end_date': 'availability.0.end',
+    'guests': 'capacity', 'coming_soon': 'flags.comingSoon',
+}
+
+
+class FakePage:
+    def on(self, event, listener):
+        pass
+
+
+@pytest.mark.parametrize('path, expected', [
+    ('data.properties', [{'id': 1}]), ('data.properties.0.id', 1), ('', {'data': {'properties': [{'id': 1}]}}),
+    ('data.missing', None), ('data.properties.5', None), ('data.properties.0.id.deeper', None),
+])
+def test_dotted_paths_are_resolved(path, expected):
+    assert resolve_path({'data': {'properties': [{'id': 1}]}}, path) == expected
+
+
+def test_a_record_is_rendered_like_its_card():
+    record = {
+        'address': {'city': 'Catskills, New York'}, 'capacity': 8,
+        'availability': [{'start': '2024-10-13T00:00:00', 'end': '2024-10-16'}], 'flags': {'comingSoon': True},
+    }
+    card = card_from_record(record, FIELDS)
+    assert (card.location, card.dates, card.guests, card.coming_soon) == ('catskills, new york', 'Oct 13 to Oct 16', 8, True)
+
+
+def test_a_record_without_the_configured_paths_has_no_dates_nor_guests():
+    card = card_from_record({'address': {'city': ['Catskills', 'New York']}}, FIELDS)
+    assert (card.location, card.dates, card.guests, card.coming_soon) == ('catskills, new york', None, None, False)
+
+
+def test_records_path_not_leading_to_a_list_fails_the_check():
+    collector = SearchResponseCollector(FakePage(), r'/api/search', 'data.properties', FIELDS)
+    collector.responses = [('https://example.com/api/search', {'data': {'properties': {'id': 1}}})]
+    with pytest.raises(AssertionError, match="'data.properties' does not lead to a list"):
+        collector.get_property_cards()
+
+
+def test_no_captured_response_fails_the_check():
+    collector = SearchResponseCollector(FakePage(), r'/api/search', 'data.properties', FIELDS)
+    with pytest.raises(AssertionError, match="No search response"):
+        collector.get_property_cards()
@@ -0,0 +1,16 @@
+import pytest
+
+from features.pages.property_card import PropertyCard
+
+
+@pytest.mark.parametrize('guests, expected', [
+    ('8', 8), ('8 guests', 8), (' 12+ ', 12), ('', None), (None, None),
+])
+def test_guests_are_read_from_the_leading_number(guests, expected):
+    card = PropertyCard.from_dict({'location': 'Catskills, New York', 'guests': guests})
+    assert card.guests == expected
+
+
+def test_guests_without_a_number_are_rejected():
+    with pytest.raises(ValueError, match="Guest capacity 'Sleeps eight'"):
+        PropertyCard.from_dict({'location': 'Catskills, New York', 'guests': 'Sleeps eight'})
@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+
+import pytest
+
+from utils.result_cache import feature_files, file_digest, project_sources, scenario_key
+
+
+@pytest.fixture
+def project(tmp_path):
+    """A project whose step module imports a page object and binds a feature file."""
+    (tmp_path / 'pages').mkdir()
+    (tmp_path / 'pages' / '__init__.py').write_text('')
+    (tmp_path / 'pages' / 'home_page.py').write_text("SEARCH = 'button.search'\n")
+    (tmp_path / 'scenarios').mkdir()
+    (tmp_path / 'scenarios' / 'search.feature').write_text("Feature: Search\n  Scenario: TC-01\n")
+    (tmp_path / 'steps').mkdir()
+    (tmp_path / 'steps' / 'test_search_steps.py').write_text(
+        "import os\n"
+        "from pytest_bdd import scenarios\n"
+        "from pages.home_page import SEARCH\n"
+        "scenarios(os.path.join(os.path.dirname(__file__), '../scenarios/search.feature'))\n"
+    )
+    yield tmp_path
+    for cached in (file_digest, project_sources, feature_files):
+        cached.cache_clear()
+
+
+def key(root):
+    for cached in (file_digest, project_sources, feature_files):
+        cached.cache_clear()
+    item = SimpleNamespace(path=root / 'steps' / 'test_search_steps.py', nodeid='steps/test_search_steps.py::test_tc_01')
+    return scenario_key(item, str(root), browser='chromium')
+
+
+def test_imported_project_modules_are_followed(project):
+    sources = project_sources(str(project / 'steps' / 'test_search_steps.py'), str(project))
+    assert str(project / 'pages' / 'home_page.py') in sources
+    assert not any('pytest_bdd' in path for path in sources)
+
+
+def test_the_bound_feature_file_is_found(project):
+    assert feature_files(str(project / 'steps' / 'test_search_steps.py')) == {str(project / 'scenarios' / 'search.feature')}
+
+
+@pytest.mark.parametrize('edited', ['pages/home_page.py', 'scenarios/search.feature'])
+def test_editing_a_file_the_scenario_depends_on_changes_its_key(project, edited):
+    before = key(project)
+    with open(project / edited, 'a') as edited_file:
+        edited_file.write("# edited\n")
+    assert key(project) != before
+
+
+def test_an_unchanged_project_keeps_its_key(project):
+    assert key(project) == key(project)
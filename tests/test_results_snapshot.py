@@ -0,0 +1,40 @@
+from features.pages.results_snapshot import parse_html, parse_property_cards, select
+
+CARD = """
+<a class="card-wrapper" href="/property/{slug}">
+  <div class="text-property-eyebrow">{location}</div>
+  <span class="whitespace-nowrap text-6-white">{dates}</span>
+  <div class="flex items-center gap-1 text-sm pl-1">
+    <span>icon</span><span>&middot;</span><span>{guests} guests</span>
+  </div>
+  {badge}
+</a>
+"""
+
+
+def results_page(*cards):
+    return f"<html><body><div id='properties-list'>{''.join(cards)}</div></body></html>"
+
+
+def test_select_matches_descendant_compound_selectors():
+    root = parse_html("<div id='list'><p class='a b'>one</p><div><p class='a'>two</p></div></div><p class='a b'>out</p>")
+    assert [element.text() for element in select(root, 'div#list p.a')] == ['one', 'two']
+    assert [element.text() for element in select(root, 'div#list p.a.b')] == ['one']
+
+
+def test_select_counts_nth_of_type_among_siblings_of_the_same_tag():
+    root = parse_html("<div><span>1</span><b>x</b><span>2</span><span>3</span></div>")
+    assert [element.text() for element in select(root, 'div span:nth-of-type(2)')] == ['2']
+    assert select(root, 'div span:nth-of-type(4)') == []
+
+
+def test_property_cards_are_parsed_from_a_results_page():
+    html = results_page(
+        CARD.format(slug='one', location='Catskills, New York', dates='Oct 13 to Oct 16', guests=8, badge=''),
+        CARD.format(slug='two', location='Hudson, New York', dates='', guests=4, badge='<p>Coming soon</p>'),
+    )
+    cards = parse_property_cards(html)
+    assert [(card.location, card.dates, card.guests, card.coming_soon) for card in cards] == [
+        ('catskills, new york', 'Oct 13 to Oct 16', 8, False),
+        ('hudson, new york', '', 4, True),
+    ]
@@ -0,0 +1,114 @@
+import json
+import os
+import re
+import time
+import weakref
+from collections import deque
+
+from config.logger_config import setup_logger
+from utils.timing import recorder
+
+logger = setup_logger(__name__)
+
+# Contexts whose tracing was started, it then runs for their whole life with one chunk per scenario
+_traced_contexts = weakref.WeakSet()
+
+
+class FlightRecorder:
+    """
+    Keeps the last events of a scenario in memory and writes them out only when it fails.
+
+    Console messages, page errors, navigations and network events of the page go to a
+    bounded ring buffer, so a passing scenario only pays for appending to a deque. When a
+    step fails, `dump` writes the buffer with the last timed actions, a screenshot, the
+    DOM and, when tracing is on, the Playwright trace of the scenario.
+    """
+
+    def __init__(self, page, size=200, trace=False):
+        """
+        Start recording the events of a page.
+
+        Args:
+            page (Page): The page of the scenario
+            size (int): Maximum number of events and actions kept
+            trace (bool): Also record a Playwright trace chunk, kept only on failure
+        """
+        self.page = page
+        self.size = size
+        self.trace = trace
+        self.events = deque(maxlen=size)
+        self.listeners = {
+            'console': lambda message: self._add('console', f"{message.type}: {message.text}"),
+            'pageerror': lambda error: self._add('pageerror', str(error)),
+            'framenavigated': lambda frame: frame == page.main_frame and self._add('navigation', frame.url),
+            'request': lambda request: self._add('request', f"{request.method} {request.url}"),
+            'response': lambda response: self._add('response', f"{response.status} {response.url}"),
+            'requestfailed': lambda request: self._add('requestfailed', f"{request.url} {request.failure}"),
+        }
+        for event, listener in self.listeners.items():
+            page.on(event, listener)
+        if trace:
+            if page.context not in _traced_contexts:
+                page.context.tracing.start(screenshots=True, snapshots=True)
+                _traced_contexts.add(page.context)
+            page.context.tracing.start_chunk()
+
+    @classmethod
+    def from_config(cls, page, settings):
+        """
+        Build a recorder from the `failure_capture` section of the YAML configuration.
+
+        Args:
+            page (Page): The page of the scenario
+            settings (dict): The `failure_capture` settings, may be None
+
+        Returns:
+            FlightRecorder: The recorder, or None when failure capture is disabled
+        """
+        settings = settings or {}
+        if not settings.get('enabled', False):
+            return None
+        return cls(page, settings.get('buffer_size', 200), settings.get('trace', False))
+
+    def _add(self, kind, detail):
+        self.events.append({'time': round(time.time(), 3), 'kind': kind, 'detail': detail})
+
+    def dump(self, directory, scenario):
+        """
+        Write what was recorded for a failed scenario.
+
+        Args:
+            directory (str): Directory of the failure artifacts, one subdirectory per browser
+            scenario (str): The pytest node id of the scenario
+
+        Returns:
+            dict: Paths of the written `events`, `screenshot`, `dom` and `trace` files
+        """
+        browser = self.page.context.browser
+        directory = os.path.join(directory, browser.browser_type.name if browser else '', re.sub(r'[^\w.-]+', '_', scenario))
+        os.makedirs(directory, exist_ok=True)
+        artifacts = {'events': os.path.join(directory, 'events.json')}
+        actions = [entry for entry in recorder.entries if entry['scenario'] == scenario][-self.size:]
+        with open(artifacts['events'], 'w') as events_file:
+            json.dump({'events': list(self.events), 'actions': actions}, events_file, indent=2)
+        try:
+            artifacts['screenshot'] = os.path.join(directory, 'screenshot.png')
+            self.page.screenshot(path=artifacts['screenshot'], full_page=True)
+            artifacts['dom'] = os.path.join(directory, 'dom.html')
+            with open(artifacts['dom'], 'w', encoding='utf-8') as dom_file:
+                dom_file.write(self.page.content())
+        except Exception as error:
+            logger.warning(f"Could not capture the page of {scenario}: {error}")
+        if self.trace:
+            artifacts['trace'] = os.path.join(directory, 'trace.zip')
+            self.page.context.tracing.stop_chunk(path=artifacts['trace'])
+            self.trace = False
+        logger.info(f"Failure artifacts of {scenario} written to {directory}.")
+        return {name: path for name, path in artifacts.items() if os.path.exists(path)}
+
+    def close(self):
+        """Stop listening to the page and drop the trace chunk of a passing scenario."""
+        for event, listener in self.listeners.items():
+            self.page.remove_listener(event, listener)
+        if self.trace:
+            self.page.context.tracing.stop_chunk()
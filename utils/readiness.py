@@ -0,0 +1,334 @@
+import asyncio
+import functools
+import inspect
+import re
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from config.browser_config import load_config
+from config.logger_config import setup_logger
+from utils.timing import current, recorder
+
+logger = setup_logger(__name__)
+
+# The rendered property cards of the results page
+RESULT_CARDS = "#properties-list a.card-wrapper, div.text-property-eyebrow"
+
+# Remembers the cards shown before an action, so that `PROPERTIES_RENDERED` only holds
+# again once the action rendered other cards. A new document starts without the mark.
+MARK_RESULTS_SCRIPT = "(cards) => { window.__staleResults = new WeakSet(document.querySelectorAll(cards)); }"
+
+
+@dataclass(frozen=True)
+class Condition:
+    """
+    A named state the page has to reach before an action can run.
+
+    Attributes:
+        description (str): Human readable name used in the logs
+        predicate (str): JavaScript expression that is truthy once the page is ready
+        response_setting (str): Key of `readiness` in config.yaml holding a regular expression;
+            the condition is met once a response whose URL matches it has arrived
+    """
+    description: str
+    predicate: Optional[str] = None
+    response_setting: Optional[str] = None
+
+
+class Readiness(Enum):
+    SEARCH_BAR_READY = Condition(
+        "search bar ready",
+        predicate="[...document.querySelectorAll('button')].some(b => b.innerText.trim() === 'Wherever')",
+    )
+    LOCATION_POPOVER_OPEN = Condition(
+        "location popover open",
+        predicate="!!document.querySelector('label input[type=checkbox], label [role=checkbox]')",
+    )
+    CALENDAR_READY = Condition(
+        "calendar ready",
+        predicate="[...document.querySelectorAll('button')].some(b => /^\\d{1,2}$/.test(b.innerText.trim()))",
+    )
+    GUESTS_POPOVER_OPEN = Condition(
+        "guests popover open",
+        predicate="!!document.querySelector(\"button svg use[href*='plus']\")",
+    )
+    SEARCH_RESULTS_RESPONDED = Condition(
+        "search results API responded",
+        response_setting='search_response_url',
+    )
+    PROPERTIES_RENDERED = Condition(
+        "properties list rendered",
+        predicate=f"[...document.querySelectorAll('{RESULT_CARDS}')]"
+                  ".some(card => !(window.__staleResults && window.__staleResults.has(card)))",
+    )
+
+
+class ReadinessEngine:
+    """
+    Waits for named page conditions instead of a blanket `networkidle`.
+
+    DOM conditions are polled inside the browser on every animation frame, response
+    conditions are fed by a `response` listener, so a wait ends as soon as the first
+    of the requested conditions holds. Every wait is logged with its duration and the
+    condition that ended it.
+    """
+
+    def __init__(self, page):
+        """
+        Initialize the engine for a page and start listening to its responses.
+
+        Args:
+            page (Page): The Playwright page to watch
+        """
+        config = load_config()['default']
+        settings = config.get('readiness') or {}
+        self.page = page
+        self.timeout = config['timeout'] * 1000
+        self.poll_interval = settings.get('poll_interval', 50)
+        self._response_patterns = {
+            key: re.compile(value) for key, value in settings.items() if key.endswith('_url') and value
+        }
+        self._responses = {}
+        self.page.on('response', self._on_response)
+
+    def close(self):
+        """Stop listening to the responses of the page, which may outlive the engine."""
+        self.page.remove_listener('response', self._on_response)
+
+    def _on_response(self, response):
+        for key, pattern in self._response_patterns.items():
+            if pattern.search(response.url):
+                self._responses[key] = time.perf_counter()
+
+    def _configured(self, conditions):
+        """
+        Drop the response conditions whose URL is not configured in `readiness`, so that
+        waiting on an unknown API never blocks an action; the DOM conditions still apply.
+        """
+        return [c for c in conditions if c.value.predicate or c.value.response_setting in self._response_patterns]
+
+    def _responded(self, condition, since):
+        return self._responses.get(condition.value.response_setting, float('-inf')) >= since
+
+    def _prepare(self, conditions, since, timeout):
+        dom_conditions = [c for c in conditions if c.value.predicate]
+        network_conditions = [c for c in conditions if c.value.response_setting]
+        script = "() => [%s].findIndex(ready => ready) + 1" % ", ".join(
+            f"!!({c.value.predicate})" for c in dom_conditions
+        )
+        timeout = self.timeout if timeout is None else timeout
+        since = float('-inf') if since is None else since
+        return dom_conditions, network_conditions, script, since, timeout
+
+    def _check_network(self, network_conditions, since, started, timeout):
+        from playwright.sync_api import TimeoutError
+
+        if (time.perf_counter() - started) * 1000 > timeout:
+            raise TimeoutError(f"Timeout {timeout}ms exceeded")
+        return next((c for c in network_conditions if self._responded(c, since)), None)
+
+    def _log_result(self, conditions, met, started, timeout):
+        if met is None:
+            names = ", ".join(c.value.description for c in conditions)
+            logger.error(f"Page not ready after {timeout}ms waiting for: {names}.")
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+        logger.info(f"Ready in {elapsed:.0f}ms: {met.value.description}.")
+
+    def wait_for(self, *conditions, since=None, timeout=None):
+        """
+        Block until the first of the given conditions is met.
+
+        Args:
+            *conditions (Readiness): Conditions to race, in order of preference
+            since (float): `time.perf_counter()` value responses must be newer than,
+                any response counts when omitted
+            timeout (float): Maximum wait in milliseconds, defaults to `timeout` from config.yaml
+
+        Returns:
+            Readiness: The condition that ended the wait, None when none of them is configured
+
+        Raises:
+            TimeoutError: If none of the conditions is met in time
+        """
+        conditions = self._configured(conditions)
+        if not conditions:
+            return None
+        dom_conditions, network_conditions, script, since, timeout = self._prepare(conditions, since, timeout)
+        started = time.perf_counter()
+        entry = recorder.start('readiness', " | ".join(c.value.description for c in conditions), wait=True)
+        met = None
+        try:
+            if not network_conditions:
+                handle = self.page.wait_for_function(script, polling='raf', timeout=timeout)
+                met = dom_conditions[handle.json_value() - 1]
+            while met is None:
+                met = self._check_network(network_conditions, since, started, timeout)
+                if met is None and dom_conditions:
+                    index = self.page.evaluate(script)
+                    met = dom_conditions[index - 1] if index else None
+                if met is None:
+                    self.page.wait_for_timeout(self.poll_interval)
+        finally:
+            recorder.stop(entry, failed=met is None)
+            self._log_result(conditions, met, started, timeout)
+        return met
+
+    def mark_results(self):
+        """
+        Mark the property cards shown now as stale: `PROPERTIES_RENDERED` only holds again
+        once other cards are rendered, or on a new document.
+        """
+        self.page.evaluate(MARK_RESULTS_SCRIPT, RESULT_CARDS)
+
+    @contextmanager
+    def after(self, *conditions, timeout=None):
+        """
+        Wait for the conditions once the wrapped action has run.
+
+        Responses are only taken into account from the moment the block is entered,
+        so a response triggered by the action cannot be missed nor confused with an
+        earlier one. Likewise the results shown before the action are marked stale,
+        so `PROPERTIES_RENDERED` waits for the results the action brings in.
+
+        Args:
+            *conditions (Readiness): Conditions to race
+            timeout (float): Maximum wait in milliseconds
+        """
+        since = time.perf_counter()
+        self.mark_results()
+        yield
+        self.wait_for(*conditions, since=since, timeout=timeout)
+
+
+class AsyncReadinessEngine(ReadinessEngine):
+    """
+    The readiness engine for pages of the asyncio Playwright API.
+    """
+
+    async def wait_for(self, *conditions, since=None, timeout=None):
+        """
+        Wait until the first of the given conditions is met.
+
+        Args:
+            *conditions (Readiness): Conditions to race, in order of preference
+            since (float): `time.perf_counter()` value responses must be newer than,
+                any response counts when omitted
+            timeout (float): Maximum wait in milliseconds, defaults to `timeout` from config.yaml
+
+        Returns:
+            Readiness: The condition that ended the wait, None when none of them is configured
+
+        Raises:
+            TimeoutError: If none of the conditions is met in time
+        """
+        conditions = self._configured(conditions)
+        if not conditions:
+            return None
+        dom_conditions, network_conditions, script, since, timeout = self._prepare(conditions, since, timeout)
+        started = time.perf_counter()
+        entry = recorder.start('readiness', " | ".join(c.value.description for c in conditions), wait=True)
+        met = None
+        try:
+            if not network_conditions:
+                handle = await self.page.wait_for_function(script, polling='raf', timeout=timeout)
+                met = dom_conditions[await handle.json_value() - 1]
+            while met is None:
+                met = self._check_network(network_conditions, since, started, timeout)
+                if met is None and dom_conditions:
+                    index = await self.page.evaluate(script)
+                    met = dom_conditions[index - 1] if index else None
+                if met is None:
+                    await asyncio.sleep(self.poll_interval / 1000)
+        finally:
+            recorder.stop(entry, failed=met is None)
+            self._log_result(conditions, met, started, timeout)
+        return met
+
+    async def mark_results(self):
+        """
+        Mark the property cards shown now as stale: `PROPERTIES_RENDERED` only holds again
+        once other cards are rendered, or on a new document.
+        """
+        await self.page.evaluate(MARK_RESULTS_SCRIPT, RESULT_CARDS)
+
+    @asynccontextmanager
+    async def after(self, *conditions, timeout=None):
+        """
+        Wait for the conditions once the wrapped action has run.
+
+        Args:
+            *conditions (Readiness): Conditions to race
+            timeout (float): Maximum wait in milliseconds
+        """
+        since = time.perf_counter()
+        await self.mark_results()
+        yield
+        await self.wait_for(*conditions, since=since, timeout=timeout)
+
+
+def requires(*conditions):
+    """
+    Declare the readiness conditions a page object method needs before it runs.
+
+    The decorated method's object must expose a `readiness` engine; coroutine
+    methods await the asyncio engine.
+
+    Args:
+        *conditions (Readiness): Conditions to race before running the method
+    """
+    def decorator(method):
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                await self.readiness.wait_for(*conditions)
+                return await method(self, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            self.readiness.wait_for(*conditions)
+            return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def retry_step(*conditions, retries=None):
+    """
+    Retry a failed pytest-bdd step on the same page instead of failing the whole scenario.
+
+    Before every retry the conditions are waited for again through the `readiness` engine
+    of the step's page object fixture, so a late render only costs the step it broke. Every
+    retry is logged and counted in the timings of the step, which show in the report. Only
+    meant for steps that can safely run twice, such as verifications.
+
+    Args:
+        *conditions (Readiness): Conditions to wait for before retrying
+        retries (int): Maximum retries of the step, defaults to `retries` from config.yaml
+    """
+    def decorator(step):
+        @functools.wraps(step)
+        def wrapper(*args, **kwargs):
+            from playwright.sync_api import Error
+
+            limit = load_config()['default'].get('retries', 0) if retries is None else retries
+            page_object = next(
+                (value for value in kwargs.values() if isinstance(getattr(value, 'readiness', None), ReadinessEngine)),
+                None,
+            )
+            for attempt in range(1, limit + 2):
+                try:
+                    return step(*args, **kwargs)
+                except (AssertionError, Error) as error:
+                    if attempt > limit:
+                        raise
+                    reason = str(error).splitlines()[0] if str(error) else type(error).__name__
+                    logger.warning(f"Retrying step '{current('step') or step.__name__}' ({attempt}/{limit}) after: {reason}")
+                    recorder.add_retry()
+                    if page_object and conditions:
+                        page_object.readiness.wait_for(*conditions)
+        return wrapper
+    return decorator
@@ -0,0 +1,215 @@
+import ast
+import functools
+import hashlib
+import os
+import time
+from importlib import metadata
+
+# Key of the passed results in the pytest cache (.pytest_cache)
+CACHE_KEY = 'wander/passed_scenarios'
+
+# Packages whose installed version can change a result
+VERSIONED_PACKAGES = ('playwright', 'pytest', 'pytest-bdd')
+
+# pytest-bdd functions binding a test module to feature files
+SCENARIO_BINDERS = ('scenario', 'scenarios')
+
+
+@functools.lru_cache(maxsize=None)
+def file_digest(path):
+    """
+    SHA-256 of a file's content, empty for a missing file.
+
+    Args:
+        path (str): Path of the file
+
+    Returns:
+        str: The hex digest
+    """
+    if not os.path.exists(path):
+        return ''
+    with open(path, 'rb') as source_file:
+        return hashlib.sha256(source_file.read()).hexdigest()
+
+
+def _module_file(root, module):
+    base = os.path.join(root, *module.split('.'))
+    for candidate in (base + '.py', os.path.join(base, '__init__.py')):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def project_sources(path, root):
+    """
+    Python files of the project a module uses, itself included, following its imports.
+
+    Args:
+        path (str): Path of the module, e.g. a step definitions file
+        root (str): Root directory of the project; modules outside it are ignored
+
+    Returns:
+        frozenset[str]: The paths of the module and of every project module it imports
+    """
+    seen = set()
+    pending = [os.path.abspath(path)]
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        with open(current, 'r', encoding='utf-8') as source_file:
+            tree = ast.parse(source_file.read(), current)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                # `from package import module` may import a submodule
+                modules = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            pending.extend(filter(None, (_module_file(root, module) for module in modules)))
+    return frozenset(seen)
+
+
+@functools.lru_cache(maxsize=None)
+def feature_files(path):
+    """
+    Feature files a test module binds with `scenario(...)` or `scenarios(...)`, read from
+    the string arguments of those calls, relative to the module like pytest-bdd does.
+    A directory argument stands for every feature file under it.
+
+    Args:
+        path (str): Path of the test module, e.g. a step definitions file
+
+    Returns:
+        frozenset[str]: The paths of the feature files
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    with open(path, 'r', encoding='utf-8') as source_file:
+        tree = ast.parse(source_file.read(), path)
+    found = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        name = node.func.attr if isinstance(node.func, ast.Attribute) else getattr(node.func, 'id', None)
+        if name not in SCENARIO_BINDERS:
+            continue
+        for argument in node.args:
+            for constant in ast.walk(argument):
+                if not isinstance(constant, ast.Constant) or not isinstance(constant.value, str):
+                    continue
+                target = os.path.normpath(os.path.join(directory, constant.value))
+                if os.path.isdir(target):
+                    found.update(
+                        os.path.join(folder, file_name)
+                        for folder, _, file_names in os.walk(target)
+                        for file_name in file_names if file_name.endswith('.feature')
+                    )
+                elif target.endswith('.feature') and os.path.isfile(target):
+                    found.add(target)
+    return frozenset(found)
+
+
+def scenario_text(item):
+    """
+    What identifies a test among those of its module: its node id and test parameters.
+
+    Args:
+        item (pytest.Item): The collected scenario
+
+    Returns:
+        str: The node id, followed by the parameters of a parametrized test
+    """
+    callspec = getattr(item, 'callspec', None)
+    if callspec:
+        return f"{item.nodeid}\n{sorted(callspec.params.items())!r}"
+    return item.nodeid
+
+
+@functools.lru_cache(maxsize=None)
+def package_versions():
+    """
+    The installed versions of the packages a result depends on.
+
+    Returns:
+        str: One `name==version` per package, `name==missing` when not installed
+    """
+    versions = []
+    for name in VERSIONED_PACKAGES:
+        try:
+            versions.append(f"{name}=={metadata.version(name)}")
+        except metadata.PackageNotFoundError:
+            versions.append(f"{name}==missing")
+    return "\n".join(versions)
+
+
+def scenario_key(item, root, extra_files=(), browser=''):
+    """
+    Hash everything a scenario's result depends on: its node id and parameters, the feature
+    files its test module binds, the step definitions, page objects and other project
+    modules the test module imports, extra files such as the configuration and the HAR
+    fixture it replays, the browser engine and the installed versions of Playwright,
+    pytest and pytest-bdd.
+
+    Args:
+        item (pytest.Item): The collected scenario
+        root (str): Root directory of the project
+        extra_files (Iterable[str]): Other files the result depends on
+        browser (str): The browser engine the scenario runs in
+
+    Returns:
+        str: The hex digest identifying this version of the scenario
+    """
+    digest = hashlib.sha256(scenario_text(item).encode())
+    digest.update(f"\nbrowser={browser}\n{package_versions()}".encode())
+    files = set(project_sources(str(item.path), root)) | feature_files(str(item.path))
+    files |= {os.path.abspath(path) for path in extra_files}
+    for path in sorted(files):
+        digest.update(f"\n{os.path.relpath(path, root)}:{file_digest(path)}".encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Remembers the scenario keys that passed, in the pytest cache, so that a scenario whose
+    key is unchanged does not need to run again.
+    """
+
+    def __init__(self, cache, max_entries=1000):
+        """
+        Load the passed keys.
+
+        Args:
+            cache (pytest.Cache): The pytest cache of the session (`config.cache`)
+            max_entries (int): Keys kept, the oldest passes being dropped first
+        """
+        self.cache = cache
+        self.max_entries = max_entries
+        self.passed = cache.get(CACHE_KEY, {})
+
+    def has_passed(self, key):
+        """
+        Whether a scenario with this key already passed.
+
+        Args:
+            key (str): The key from `scenario_key`
+        """
+        return key in self.passed
+
+    def record(self, key, nodeid):
+        """
+        Remember that a scenario passed, or refresh the time of a cached pass so that it
+        is not dropped as one of the oldest.
+
+        Args:
+            key (str): The key from `scenario_key`
+            nodeid (str): The pytest node id of the scenario, for reference
+        """
+        self.passed[key] = {'nodeid': nodeid, 'passed_at': time.time()}
+
+    def save(self):
+        """Write the passed keys back to the pytest cache."""
+        newest = sorted(self.passed.items(), key=lambda entry: entry[1]['passed_at'])[-self.max_entries:]
+        self.cache.set(CACHE_KEY, dict(newest))
@@ -0,0 +1,55 @@
+import time
+from contextlib import contextmanager
+
+
+class StartupProfile:
+    """
+    Accumulates the time a session spends before its first step runs: framework imports,
+    collection, configuration loading and browser launch.
+
+    Phases are kept in the order they are first seen; a phase measured several times (e.g.
+    every `load_config` call) adds up, with its number of calls.
+    """
+
+    def __init__(self):
+        self.phases = {}
+
+    def add(self, phase, milliseconds):
+        """
+        Add time to a phase.
+
+        Args:
+            phase (str): Name of the phase, e.g. `config loading`
+            milliseconds (float): Time spent
+        """
+        total, calls = self.phases.get(phase, (0.0, 0))
+        self.phases[phase] = (total + milliseconds, calls + 1)
+
+    @contextmanager
+    def measure(self, phase):
+        """
+        Add the time spent in the wrapped block to a phase.
+
+        Args:
+            phase (str): Name of the phase
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, (time.perf_counter() - started) * 1000)
+
+    def rows(self):
+        """
+        The measured phases.
+
+        Returns:
+            list[dict]: Rows with `phase`, `total_ms` and `calls`
+        """
+        return [
+            {'phase': phase, 'total_ms': round(total, 1), 'calls': calls}
+            for phase, (total, calls) in self.phases.items()
+        ]
+
+
+profile = StartupProfile()
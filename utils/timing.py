@@ -0,0 +1,224 @@
+import contextvars
+import functools
+import inspect
+import time
+
+# Playwright calls that are timed when instrumentation is on, the second group
+# being waits whose whole duration also counts as wait time
+PLAYWRIGHT_ACTIONS = (
+    'goto', 'click', 'check', 'fill', 'press', 'inner_text', 'evaluate', 'count',
+    'query_selector', 'query_selector_all', 'screenshot', 'content',
+)
+PLAYWRIGHT_WAITS = (
+    'wait_for_selector', 'wait_for_function', 'wait_for_load_state', 'wait_for_timeout',
+    'wait_for_url', 'to_be_visible',
+)
+
+# Measurements currently open in this thread or asyncio task, innermost last
+_open_entries = contextvars.ContextVar('open_timing_entries', default=())
+
+
+class TimingRecorder:
+    """
+    Collects wall time, wait time and retry counts of steps, page object methods
+    and Playwright calls.
+
+    Measurements nest: a wait or a retry recorded while a Playwright call runs inside
+    a page object method inside a step is added to all three. Waits nested in another
+    wait (a Playwright wait inside a readiness wait) are only counted once. Entries are plain dicts
+    so they can travel in test reports between pytest-xdist workers and the controller.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.scenario = None
+
+    def start(self, kind, name, wait=False):
+        """
+        Open a measurement.
+
+        Args:
+            kind (str): What is measured: `step`, `page`, `readiness` or `playwright`
+            name (str): Step text, method name, readiness condition or Playwright call
+            wait (bool): Whether the whole measurement is time spent waiting
+
+        Returns:
+            dict: The entry, to be passed to `stop`
+        """
+        entry = {
+            'scenario': self.scenario, 'kind': kind, 'name': name,
+            'duration_ms': 0.0, 'wait_ms': 0.0, 'retries': 0, 'failed': False,
+            '_started': time.perf_counter(), '_wait': wait,
+        }
+        _open_entries.set(_open_entries.get() + (entry,))
+        return entry
+
+    def stop(self, entry, failed=False):
+        """
+        Close a measurement and keep it.
+
+        Args:
+            entry (dict): The entry returned by `start`
+            failed (bool): Whether the measured operation raised
+        """
+        _open_entries.set(tuple(e for e in _open_entries.get() if e is not entry))
+        elapsed = (time.perf_counter() - entry.pop('_started')) * 1000
+        if entry.pop('_wait'):
+            if not any(e['_wait'] for e in _open_entries.get()):
+                self.add_wait(elapsed)
+            entry['wait_ms'] = round(elapsed, 1)
+        entry['duration_ms'] = round(elapsed, 1)
+        entry['failed'] = failed
+        self.entries.append(entry)
+
+    def add_wait(self, milliseconds):
+        """
+        Add time spent waiting for the page to every open measurement.
+
+        Args:
+            milliseconds (float): Duration of the wait
+        """
+        for entry in _open_entries.get():
+            entry['wait_ms'] = round(entry['wait_ms'] + milliseconds, 1)
+
+    def add_retry(self):
+        """Count a retry in every open measurement."""
+        for entry in _open_entries.get():
+            entry['retries'] += 1
+
+    def take(self, scenario):
+        """
+        Remove and return the entries of a scenario.
+
+        Args:
+            scenario (str): The scenario (pytest node id) the entries belong to
+
+        Returns:
+            list[dict]: The entries, in completion order
+        """
+        taken = [entry for entry in self.entries if entry['scenario'] == scenario]
+        self.entries = [entry for entry in self.entries if entry['scenario'] != scenario]
+        return taken
+
+    def timed(self, kind, name, wait=False):
+        """
+        Decorate a function or coroutine function so every call is measured.
+
+        Args:
+            kind (str): What is measured
+            name (str): Name of the entries
+            wait (bool): Whether the whole call is time spent waiting
+        """
+        def decorator(function):
+            if inspect.iscoroutinefunction(function):
+                @functools.wraps(function)
+                async def async_wrapper(*args, **kwargs):
+                    entry = self.start(kind, name, wait)
+                    try:
+                        result = await function(*args, **kwargs)
+                    except BaseException:
+                        self.stop(entry, failed=True)
+                        raise
+                    self.stop(entry)
+                    return result
+                return async_wrapper
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                entry = self.start(kind, name, wait)
+                try:
+                    result = function(*args, **kwargs)
+                except BaseException:
+                    self.stop(entry, failed=True)
+                    raise
+                self.stop(entry)
+                return result
+            return wrapper
+        return decorator
+
+
+recorder = TimingRecorder()
+
+
+def current(kind):
+    """
+    Name of the innermost open measurement of a kind in this thread or asyncio task.
+
+    Args:
+        kind (str): What is measured, e.g. `step`
+
+    Returns:
+        str: The step text, method name... or None when none is open
+    """
+    for entry in reversed(_open_entries.get()):
+        if entry['kind'] == kind:
+            return entry['name']
+    return None
+
+
+def timed_methods(cls):
+    """
+    Class decorator measuring every public method of a page object.
+    Generator methods, asynchronous ones included, are left alone: their work happens
+    after the call returns.
+
+    Args:
+        cls (type): The page object class
+    """
+    for name, method in list(vars(cls).items()):
+        generator = inspect.isgeneratorfunction(method) or inspect.isasyncgenfunction(method)
+        if callable(method) and not name.startswith('_') and not generator:
+            setattr(cls, name, recorder.timed('page', f"{cls.__name__}.{name}")(method))
+    return cls
+
+
+def instrument_playwright():
+    """
+    Measure the Playwright actions and waits of the sync API for the rest of the process.
+
+    Returns:
+        Callable: Restores the original Playwright methods
+    """
+    from playwright.sync_api import ElementHandle, Locator, LocatorAssertions, Page
+
+    originals = []
+    for cls in (Page, Locator, ElementHandle, LocatorAssertions):
+        for name in PLAYWRIGHT_ACTIONS + PLAYWRIGHT_WAITS:
+            method = vars(cls).get(name)
+            if method is None:
+                continue
+            originals.append((cls, name, method))
+            wrapped = recorder.timed('playwright', f"{cls.__name__}.{name}", wait=name in PLAYWRIGHT_WAITS)(method)
+            setattr(cls, name, wrapped)
+
+    def restore():
+        for cls, name, method in originals:
+            setattr(cls, name, method)
+    return restore
+
+
+def slowest(entries, kind='step', limit=10):
+    """
+    Aggregate entries by name and sort them by total time.
+
+    Args:
+        entries (Iterable[dict]): Timing entries
+        kind (str): Only aggregate entries of this kind
+        limit (int): Maximum number of rows
+
+    Returns:
+        list[dict]: Rows with `name`, `calls`, `total_ms`, `max_ms`, `wait_ms` and `retries`
+    """
+    rows = {}
+    for entry in entries:
+        if entry['kind'] != kind:
+            continue
+        row = rows.setdefault(entry['name'], {
+            'name': entry['name'], 'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'wait_ms': 0.0, 'retries': 0,
+        })
+        row['calls'] += 1
+        row['total_ms'] = round(row['total_ms'] + entry['duration_ms'], 1)
+        row['max_ms'] = max(row['max_ms'], entry['duration_ms'])
+        row['wait_ms'] = round(row['wait_ms'] + entry['wait_ms'], 1)
+        row['retries'] += entry['retries']
+    return sorted(rows.values(), key=lambda row: row['total_ms'], reverse=True)[:limit]
@@ -1,6 +1,5 @@
 # utils.py
-def scroll_to_city(page, city: str):
-    result = page.evaluate('''(city) => {
+SCROLL_TO_CITY_SCRIPT = '''(city) => {
         const labels = [...document.querySelectorAll('label')];
         const element = labels.find(label => label.textContent.trim().toLowerCase() === city.toLowerCase());
         if (element) {
@@ -9,13 +8,29 @@ def scroll_to_city(page, city: str):
         } else {
             return 'Element not found';
         }
-    }''', city)
+    }'''
 
-def scroll_to_bottom(page):
-    page.evaluate("""
+SCROLL_TO_BOTTOM_SCRIPT = """
             window.scrollTo({
                 top: document.body.scrollHeight,
                 behavior: 'smooth'
             });
-        """)
-    page.wait_for_load_state('networkidle')
+        """
+
+SCROLLED_TO_BOTTOM_SCRIPT = "() => window.innerHeight + window.scrollY >= document.body.scrollHeight - 1"
+
+
+def scroll_to_city(page, city: str):
+    result = page.evaluate(SCROLL_TO_CITY_SCRIPT, city)
+
+def scroll_to_bottom(page):
+    page.evaluate(SCROLL_TO_BOTTOM_SCRIPT)
+    # Wait for the smooth scroll to land instead of for the whole network to go quiet
+    page.wait_for_function(SCROLLED_TO_BOTTOM_SCRIPT, polling='raf')
+
+async def async_scroll_to_city(page, city: str):
+    await page.evaluate(SCROLL_TO_CITY_SCRIPT, city)
+
+async def async_scroll_to_bottom(page):
+    await page.evaluate(SCROLL_TO_BOTTOM_SCRIPT)
+    await page.wait_for_function(SCROLLED_TO_BOTTOM_SCRIPT, polling='raf')
@@ -0,0 +1,209 @@
+import json
+import os
+import time
+import weakref
+
+from config.logger_config import setup_logger
+from utils.timing import recorder
+
+logger = setup_logger(__name__)
+
+# Installed before any page script runs: keeps the LCP, layout shifts and long tasks
+# of the document. Entry types a browser does not support are skipped.
+OBSERVE_WEB_VITALS_SCRIPT = '''(() => {
+    if (window.__webVitals) return;
+    const vitals = window.__webVitals = { lcp: null, shifts: [], longTasks: [] };
+    const observe = (type, callback) => {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(callback)).observe({ type, buffered: true });
+        } catch (error) {}
+    };
+    observe('largest-contentful-paint', entry => { vitals.lcp = entry.startTime; });
+    observe('layout-shift', entry => {
+        if (!entry.hadRecentInput) vitals.shifts.push({ start: entry.startTime, value: entry.value });
+    });
+    observe('longtask', entry => vitals.longTasks.push({ start: entry.startTime, duration: entry.duration }));
+})()'''
+
+# Reads the metrics of everything that happened since `since` (milliseconds of the
+# page clock, 0 for the whole document)
+COLLECT_WEB_VITALS_SCRIPT = '''(since) => {
+    const vitals = window.__webVitals || { lcp: null, shifts: [], longTasks: [] };
+    const [navigation] = performance.getEntriesByType('navigation');
+    const resources = performance.getEntriesByType('resource').filter(entry => entry.startTime >= since);
+    const longTasks = vitals.longTasks.filter(task => task.start >= since);
+    const transferred = resources.reduce((total, entry) => total + (entry.transferSize || 0), 0)
+        + (since === 0 && navigation ? navigation.transferSize || 0 : 0);
+    return {
+        now: performance.now(),
+        ttfb_ms: navigation ? navigation.responseStart - navigation.requestStart : null,
+        dom_content_loaded_ms: navigation && navigation.domContentLoadedEventEnd ? navigation.domContentLoadedEventEnd : null,
+        load_ms: navigation && navigation.loadEventEnd ? navigation.loadEventEnd : null,
+        lcp_ms: vitals.lcp,
+        cls: vitals.shifts.filter(shift => shift.start >= since).reduce((total, shift) => total + shift.value, 0),
+        long_tasks: longTasks.length,
+        long_task_ms: longTasks.reduce((total, task) => total + task.duration, 0),
+        transfer_kb: transferred / 1024,
+        requests: resources.length,
+    };
+}'''
+
+CURRENT_TIME_SCRIPT = "() => performance.now()"
+
+# Metrics that only describe the load of the document
+NAVIGATION_ONLY = ('ttfb_ms', 'dom_content_loaded_ms', 'load_ms', 'lcp_ms')
+
+# Pages the observers are installed in; a pooled page serves many scenarios, and init
+# scripts cannot be removed
+_observed_pages = weakref.WeakSet()
+
+
+class WebVitals:
+    """
+    Records web performance metrics of a page and checks them against budgets.
+
+    Navigation Timing, Largest Contentful Paint, Cumulative Layout Shift, long tasks
+    and transfer sizes are read from the browser's Performance APIs. Every measurement
+    is appended to a JSON lines history file so trends can be followed across deploys.
+    Transfer sizes of cross-origin resources are only known when their server sends
+    `Timing-Allow-Origin`, and blocked requests are not counted.
+    """
+
+    def __init__(self, page, budgets=None, on_budget_exceeded='warn', history='reports/web_vitals.jsonl'):
+        """
+        Start observing the metrics of a page, from its next navigation on.
+
+        Args:
+            page (Page): The Playwright page to measure
+            budgets (dict): Per measurement name, the maximum value of each metric
+            on_budget_exceeded (str): `warn` to log exceeded budgets, `fail` to raise
+            history (str): JSON lines file every measurement is appended to
+        """
+        self.page = page
+        self.budgets = budgets or {}
+        self.on_budget_exceeded = on_budget_exceeded
+        self.history = history
+        if page not in _observed_pages:
+            page.add_init_script(OBSERVE_WEB_VITALS_SCRIPT)
+            _observed_pages.add(page)
+
+    @classmethod
+    def from_config(cls, page, settings):
+        """
+        Build the recorder from the `web_vitals` section of the YAML configuration.
+
+        Args:
+            page (Page): The Playwright page to measure
+            settings (dict): The `web_vitals` settings, may be None
+
+        Returns:
+            WebVitals: The recorder, or None when web vitals are disabled
+        """
+        settings = settings or {}
+        if not settings.get('enabled', False):
+            return None
+        return cls(page, settings.get('budgets'), settings.get('on_budget_exceeded', 'warn'),
+                   settings.get('history', 'reports/web_vitals.jsonl'))
+
+    def mark(self):
+        """
+        Read the page clock, to measure what an action triggers with `measure(since=...)`.
+
+        Returns:
+            float: Milliseconds since the document started loading
+        """
+        return self.page.evaluate(CURRENT_TIME_SCRIPT)
+
+    def measure(self, name, since=None):
+        """
+        Record the metrics of the document, or of what happened since a mark, and check their budgets.
+
+        Args:
+            name (str): Name of the measurement, selecting its budgets, e.g. `navigation` or `search`
+            since (float): Mark taken before the measured action, None for the whole document load
+
+        Returns:
+            dict: The metrics
+
+        Raises:
+            AssertionError: If a budget is exceeded and `on_budget_exceeded` is `fail`
+        """
+        return self._record(name, self.page.evaluate(COLLECT_WEB_VITALS_SCRIPT, since or 0), since)
+
+    def _record(self, name, metrics, since):
+        now = metrics.pop('now')
+        if since is not None:
+            for metric in NAVIGATION_ONLY:
+                metrics.pop(metric)
+            metrics['duration_ms'] = now - since
+        metrics = {metric: round(value, 3) if isinstance(value, float) else value for metric, value in metrics.items()}
+        self._append_history(name, metrics)
+
+        exceeded = [
+            f"{metric} {metrics[metric]} > {budget}"
+            for metric, budget in (self.budgets.get(name) or {}).items()
+            if metrics.get(metric) is not None and metrics[metric] > budget
+        ]
+        logger.info(f"Web vitals of {name}: {metrics}.")
+        if exceeded:
+            message = f"Performance budget of {name} exceeded: {', '.join(exceeded)}"
+            assert self.on_budget_exceeded != 'fail', message
+            logger.warning(message)
+        return metrics
+
+    def _append_history(self, name, metrics):
+        os.makedirs(os.path.dirname(self.history) or '.', exist_ok=True)
+        browser = self.page.context.browser
+        record = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'scenario': recorder.scenario,
+            'browser': browser.browser_type.name if browser else None,
+            'url': self.page.url, 'measurement': name, 'metrics': metrics,
+        }
+        with open(self.history, 'a') as history_file:
+            history_file.write(json.dumps(record) + '\n')
+
+
+class AsyncWebVitals(WebVitals):
+    """
+    The web vitals recorder for pages of the asyncio Playwright API.
+
+    The observers cannot be installed from the constructor, so `install()` has to be
+    awaited before the first navigation.
+    """
+
+    def __init__(self, page, budgets=None, on_budget_exceeded='warn', history='reports/web_vitals.jsonl'):
+        self.page = page
+        self.budgets = budgets or {}
+        self.on_budget_exceeded = on_budget_exceeded
+        self.history = history
+
+    async def install(self):
+        """Start observing the metrics of the page, from its next navigation on."""
+        if self.page not in _observed_pages:
+            await self.page.add_init_script(OBSERVE_WEB_VITALS_SCRIPT)
+            _observed_pages.add(self.page)
+
+    async def mark(self):
+        """
+        Read the page clock, to measure what an action triggers with `measure(since=...)`.
+
+        Returns:
+            float: Milliseconds since the document started loading
+        """
+        return await self.page.evaluate(CURRENT_TIME_SCRIPT)
+
+    async def measure(self, name, since=None):
+        """
+        Record the metrics of the document, or of what happened since a mark, and check their budgets.
+
+        Args:
+            name (str): Name of the measurement, selecting its budgets, e.g. `navigation` or `search`
+            since (float): Mark taken before the measured action, None for the whole document load
+
+        Returns:
+            dict: The metrics
+
+        Raises:
+            AssertionError: If a budget is exceeded and `on_budget_exceeded` is `fail`
+        """
+        return self._record(name, await self.page.evaluate(COLLECT_WEB_VITALS_SCRIPT, since or 0), since)